@@ -15,19 +15,27 @@ import sys
 import json
 import logging
 import traceback
-from flask import Flask, render_template_string, request, jsonify, send_file, redirect, url_for, session
+from flask import Flask, request, jsonify, send_file, send_from_directory, redirect, url_for, session
 import tempfile
 import zipfile
 import shutil
+import mimetypes
+import stat
+import mmap
 from io import BytesIO
 from functools import wraps
+from contextlib import contextmanager
 import secrets
 import hashlib
 import time
 import glob
 from datetime import datetime, timedelta
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from werkzeug.security import safe_join
 
 # Load environment variables from .env file if it exists
 try:
@@ -46,7 +54,10 @@ except ImportError:
 
 # Import parser with error handling for Vercel
 try:
-    from parser import ChatGPTParser, Conversation
+    from parser import (
+        ChatGPTParser, Conversation, ijson, _json_dumps, _json_loads, _json_starts_with_list,
+        _render_markdown_batch, _sanitize_filename,
+    )
 except ImportError as e:
     import logging
     logging.error(f"Failed to import parser: {e}")
@@ -89,7 +100,9 @@ MAX_UPLOAD_SIZE_MB = int(os.environ.get('MAX_UPLOAD_SIZE_MB', '500'))
 FLASK_ENV = os.environ.get('FLASK_ENV', 'development')
 IS_PRODUCTION = FLASK_ENV == 'production'
 
-app = Flask(__name__, static_folder='static', static_url_path='/static')
+# Static files are served by serve_static below (with cache headers), so the
+# built-in static route is disabled to keep it from shadowing that view
+app = Flask(__name__, static_folder=None)
 
 # Core configuration
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max upload
@@ -198,6 +211,15 @@ except Exception as e:
 processing_jobs = {}
 job_lock = threading.Lock()
 
+# Export worker processes (spawn) re-import the launching script as __mp_main__
+# when the app is run as `python app.py`. They only render markdown, so the
+# server's background machinery is not started there.
+_IN_EXPORT_WORKER = __name__ == '__mp_main__'
+
+# Reusable worker threads for background jobs; also caps how many run at once
+PROCESSING_WORKERS = int(os.environ.get('PROCESSING_WORKERS', '4'))
+job_executor = None if _IN_EXPORT_WORKER else ThreadPoolExecutor(max_workers=PROCESSING_WORKERS, thread_name_prefix='upload-job')
+
 # Enhanced cleanup for ephemeral storage (local filesystem only)
 def cleanup_old_files():
     """Remove files older than EPHEMERAL_TTL - local filesystem cleanup (NO cloud storage)"""
@@ -209,6 +231,7 @@ def cleanup_old_files():
         for pattern in ['conv_*.json', '*_conv_*.json']:
             for filepath in glob.glob(os.path.join(STORAGE_DIR, pattern)):
                 if os.path.getmtime(filepath) < current_time - EPHEMERAL_TTL:
+                    _evict_parser(filepath)
                     try:
                         os.remove(filepath)
                         deleted_count += 1
@@ -256,8 +279,24 @@ def cleanup_old_files():
     except Exception as e:
         logger.warning(f"Error cleaning up old files: {e}")
 
+# How long a finished job stays pollable after its result was first delivered
+# (e.g. for client retries); undelivered jobs live until their expires_at
+COMPLETED_JOB_TTL = 60
+
+
+def drop_completed_jobs():
+    """Forget completed jobs delivered to the client more than COMPLETED_JOB_TTL seconds ago"""
+    cutoff = time.time() - COMPLETED_JOB_TTL
+    with job_lock:
+        stale = [job_id for job_id, job in processing_jobs.items()
+                 if job.get('status') == 'completed' and job.get('delivered_at', cutoff) < cutoff]
+        for job_id in stale:
+            del processing_jobs[job_id]
+
+
 def cleanup_expired_jobs():
     """Remove expired jobs and their associated files"""
+    drop_completed_jobs()
     current_time = time.time()
     expired_jobs = []
     
@@ -271,6 +310,8 @@ def cleanup_expired_jobs():
                 
                 # Clean up associated files
                 storage_file = job.get('storage_file')
+                if storage_file:
+                    _evict_parser(storage_file)
                 if storage_file and os.path.exists(storage_file):
                     try:
                         os.remove(storage_file)
@@ -303,9 +344,10 @@ def periodic_ephemeral_cleanup():
         time.sleep(EPHEMERAL_CLEANUP_INTERVAL)
 
 # Start cleanup thread on app startup
-cleanup_thread = threading.Thread(target=periodic_ephemeral_cleanup, daemon=True)
-cleanup_thread.start()
-logger.info("Ephemeral storage cleanup thread started")
+if not _IN_EXPORT_WORKER:
+    cleanup_thread = threading.Thread(target=periodic_ephemeral_cleanup, daemon=True)
+    cleanup_thread.start()
+    logger.info("Ephemeral storage cleanup thread started")
 
 # Authentication - disabled in local-only mode
 def login_required(f):
@@ -703,6 +745,28 @@ HTML_TEMPLATE = r"""
             overflow-y: auto;
         }
         
+        /* Windowed list for large exports: fixed-height rows in a scroll box */
+        .conversation-list.virtualized {
+            height: 75vh;
+            max-height: 75vh;
+        }
+        
+        .conversation-list.virtualized .conversation-item {
+            height: 6.5rem;
+            box-sizing: border-box;
+        }
+        
+        .conversation-list.virtualized .conv-title {
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+        
+        .conversation-list.virtualized .conv-meta {
+            flex-wrap: nowrap;
+            overflow: hidden;
+        }
+        
         .conversation-item {
             padding: 0.875rem 1rem;
             border-bottom: 1px solid var(--border-subtle);
@@ -2494,6 +2558,24 @@ HTML_TEMPLATE = r"""
                     <!-- Smart groups will be added here dynamically -->
                 </div>
                 
+                <template id="smartGroupCardTemplate">
+                    <div class="project-card">
+                        <div style="display: flex; justify-content: space-between; align-items: flex-start;">
+                            <div class="project-card-icon"></div>
+                            <button class="smart-group-delete" title="Delete group"
+                                style="background: none; border: none; color: var(--text-muted); cursor: pointer; font-size: 1.2rem;">✕</button>
+                        </div>
+                        <h3 class="project-card-title"></h3>
+                        <div class="project-card-stats">
+                            <div class="project-card-stat">
+                                <div class="project-card-stat-value"></div>
+                                <div class="project-card-stat-label">Matches</div>
+                            </div>
+                        </div>
+                        <div class="project-card-recent" style="color: var(--text-muted);"></div>
+                    </div>
+                </template>
+                
                 <div style="margin-top: 1.5rem;">
                     <h3 style="font-size: 0.75rem; margin-bottom: 0.75rem; color: var(--text-muted); text-transform: uppercase; letter-spacing: 0.04em;">
                         Suggested Groups
@@ -2537,7 +2619,7 @@ HTML_TEMPLATE = r"""
                     </div>
                     <div class="conversation-list" id="conversationList">
                         {% for conv in conversations %}
-                        <div class="conversation-item" data-id="{{ conv.id }}" data-project="{{ conv.project_id or 'unassigned' }}" onclick="showConversation('{{ conv.id }}')">
+                        <div class="conversation-item" data-id="{{ conv.id }}" data-project="{{ conv.project_id or 'unassigned' }}">
                             <h3 class="conv-title">{{ conv.title }}</h3>
                             <p class="conv-preview">{{ conv.get_preview(150) }}</p>
                             <div class="conv-meta">
@@ -2686,957 +2768,10 @@ HTML_TEMPLATE = r"""
     <div class="toast" id="toast">Copied to clipboard!</div>
     
     <script>
-        let currentConversation = null;
-        let currentMarkdown = '';
-        
-        // File Upload Handling
-        function initUpload() {
-            console.log('[UPLOAD] Initializing upload handlers...');
-            const uploadArea = document.getElementById('uploadArea');
-            const fileInput = document.getElementById('fileInput');
-            
-            if (!uploadArea || !fileInput) {
-                console.error('[UPLOAD] Upload area or file input not found!', {
-                    uploadArea: !!uploadArea,
-                    fileInput: !!fileInput
-                });
-                return;
-            }
-            console.log('[UPLOAD] Upload elements found, attaching event listeners');
-            console.log('[UPLOAD] fileInput element:', fileInput);
-            console.log('[UPLOAD] fileInput type:', fileInput.type);
-            console.log('[UPLOAD] fileInput accept:', fileInput.accept);
-            
-            // File input now covers the entire upload area, so clicks go directly to it
-            // Just need to handle the change event
-            console.log('[UPLOAD] File input configured to cover upload area - clicks will work directly');
-            
-            // Ensure file input covers the entire area and is clickable
-            fileInput.style.position = 'absolute';
-            fileInput.style.top = '0';
-            fileInput.style.left = '0';
-            fileInput.style.width = '100%';
-            fileInput.style.height = '100%';
-            fileInput.style.opacity = '0';
-            fileInput.style.cursor = 'pointer';
-            fileInput.style.zIndex = '10';
-            
-            // Make sure all child elements don't block the file input
-            const childElements = uploadArea.querySelectorAll('*:not(#fileInput)');
-            childElements.forEach(function(child) {
-                child.style.pointerEvents = 'none';
-                child.style.position = 'relative';
-                child.style.zIndex = '1';
-                console.log('[UPLOAD] Configured child element:', child.tagName, child.className || child.id);
-            });
-            
-            // Mark as initialized
-            uploadArea.setAttribute('data-listener-attached', 'true');
-            devLog('[UPLOAD] Upload handlers fully initialized and child elements configured');
-            
-            // Test click programmatically after a short delay
-            setTimeout(function() {
-                console.log('[UPLOAD] Testing fileInput.click() programmatically...');
-                try {
-                    // This is just a test - don't actually open the picker
-                    console.log('[UPLOAD] fileInput element is accessible:', {
-                        exists: !!fileInput,
-                        type: fileInput.type,
-                        accept: fileInput.accept,
-                        hasClick: typeof fileInput.click === 'function'
-                    });
-                } catch (err) {
-                    console.error('[UPLOAD] Error testing fileInput:', err);
-                }
-            }, 1000);
-            
-            // Click handler on upload area to trigger file input
-            uploadArea.addEventListener('click', function(e) {
-                // Only trigger if not clicking directly on the file input
-                if (e.target !== fileInput) {
-                    e.preventDefault();
-                    e.stopPropagation();
-                    console.log('[UPLOAD] Upload area clicked, triggering file input');
-                    fileInput.click();
-                }
-            });
-            
-            // File input change - no authentication required
-            fileInput.addEventListener('change', function() {
-                console.log('[UPLOAD] File input changed');
-                if (this.files && this.files[0]) {
-                    console.log('[UPLOAD] File selected:', this.files[0].name);
-                    uploadFile(this.files[0]);
-                }
-            });
-            
-            // Drag and drop - no authentication required
-            uploadArea.addEventListener('dragover', function(e) {
-                e.preventDefault();
-                e.stopPropagation();
-                uploadArea.classList.add('dragover');
-            });
-            
-            uploadArea.addEventListener('dragleave', function(e) {
-                e.preventDefault();
-                e.stopPropagation();
-                uploadArea.classList.remove('dragover');
-            });
-            
-            uploadArea.addEventListener('drop', function(e) {
-                console.log('[UPLOAD] File dropped');
-                e.preventDefault();
-                e.stopPropagation();
-                uploadArea.classList.remove('dragover');
-                
-                // No authentication required
-                if (e.dataTransfer.files && e.dataTransfer.files[0]) {
-                    console.log('[UPLOAD] Dropped file:', e.dataTransfer.files[0].name);
-                    uploadFile(e.dataTransfer.files[0]);
-                }
-            });
-            console.log('[UPLOAD] Upload handlers initialized');
-        }
-        
-        // Initialize upload handlers when DOM is ready
-        function initializeUpload() {
-            console.log('[UPLOAD] initializeUpload called, readyState:', document.readyState);
-            if (document.readyState === 'loading') {
-                console.log('[UPLOAD] DOM still loading, waiting for DOMContentLoaded');
-                document.addEventListener('DOMContentLoaded', function() {
-                    console.log('[UPLOAD] DOMContentLoaded fired, calling initUpload');
-                    initUpload();
-                });
-            } else {
-                // DOM is already loaded, initialize immediately
-                console.log('[UPLOAD] DOM already loaded, calling initUpload immediately');
-                initUpload();
-            }
-        }
-        
-        // Try multiple times to ensure it works
-        initializeUpload();
-        
-        // Also try after delays as fallbacks
-        setTimeout(function() {
-            const uploadArea = document.getElementById('uploadArea');
-            const fileInput = document.getElementById('fileInput');
-            console.log('[UPLOAD] Fallback check (500ms): uploadArea=', !!uploadArea, 'fileInput=', !!fileInput);
-            if (uploadArea && fileInput) {
-                if (!uploadArea.hasAttribute('data-listener-attached')) {
-                    console.log('[UPLOAD] Fallback: Re-initializing upload handlers');
-                    uploadArea.setAttribute('data-listener-attached', 'true');
-                    initUpload();
-                } else {
-                    console.log('[UPLOAD] Listeners already attached');
-                }
-            }
-        }, 500);
-        
-        setTimeout(function() {
-            const uploadArea = document.getElementById('uploadArea');
-            const fileInput = document.getElementById('fileInput');
-            console.log('[UPLOAD] Final check (2000ms): uploadArea=', !!uploadArea, 'fileInput=', !!fileInput);
-            if (uploadArea && fileInput) {
-                // Test if click works
-                console.log('[UPLOAD] Testing click handler...');
-                uploadArea.style.cursor = 'pointer';
-                uploadArea.style.userSelect = 'none';
-            }
-        }, 2000);
-        
-        async function uploadFile(file) {
-            devLog('[UPLOAD] uploadFile called');
-            devLog('[UPLOAD] File:', file.name, 'Size:', file.size, 'Type:', file.type);
-            
-            // Check authentication first
-            const isAuthenticated = await requireAuthForUpload();
-            if (!isAuthenticated) {
-                console.log('[UPLOAD] User not authenticated - showing login modal');
-                // Store file for upload after login
-                pendingFile = file;
-                showLoginModal();
-                return;
-            }
-            
-            const uploadArea = document.getElementById('uploadArea');
-            const uploadIcon = document.getElementById('uploadIcon');
-            const uploadText = document.getElementById('uploadText');
-            const uploadHint = document.getElementById('uploadHint');
-            const uploadProgress = document.getElementById('uploadProgress');
-            const progressFill = document.getElementById('progressFill');
-            const progressText = document.getElementById('progressText');
-            
-            // Validate file type
-            const fileName = file.name.toLowerCase();
-            console.log('[UPLOAD] Validating file type:', fileName);
-            if (!fileName.endsWith('.zip') && !fileName.endsWith('.json')) {
-                console.log('[UPLOAD] Invalid file type');
-                showUploadError('Please upload a ZIP file or conversations.json');
-                return;
-            }
-            console.log('[UPLOAD] File type valid');
-            
-            // Helper to truncate filename from middle if > 40 chars
-            function truncateFilename(name, maxLength = 40) {
-                if (name.length <= maxLength) return name;
-                const ext = name.lastIndexOf('.') > -1 ? name.slice(name.lastIndexOf('.')) : '';
-                const nameWithoutExt = name.slice(0, name.length - ext.length);
-                const charsToShow = maxLength - ext.length - 3; // 3 for '...'
-                const frontChars = Math.ceil(charsToShow / 2);
-                const backChars = Math.floor(charsToShow / 2);
-                return nameWithoutExt.slice(0, frontChars) + '...' + nameWithoutExt.slice(-backChars) + ext;
-            }
-            
-            // Show upload state
-            uploadArea.classList.add('uploading');
-            uploadArea.classList.remove('error', 'success');
-            uploadIcon.textContent = '⏳';
-            uploadText.textContent = 'Uploading ' + truncateFilename(file.name);
-            uploadHint.textContent = 'Please wait...';
-            uploadProgress.classList.remove('hidden');
-            progressFill.style.width = '0%';
-            progressText.textContent = 'Preparing upload...';
-            
-            // Use background job processing for all files
-            const fileSize = file.size;
-            devLog('[UPLOAD] File size: ' + (fileSize / 1024 / 1024).toFixed(2) + 'MB - using background processing');
-            uploadFileWithBackgroundProcessing(file);
-        }
-        
-        // Chunked upload for large files
-        async function uploadFileChunked(file, chunkSize) {
-            const fileId = Date.now() + '_' + Math.random().toString(36).substr(2, 9);
-            const totalChunks = Math.ceil(file.size / chunkSize);
-            const uploadArea = document.getElementById('uploadArea');
-            const progressFill = document.getElementById('progressFill');
-            const progressText = document.getElementById('progressText');
-            
-            devLog('[UPLOAD] Starting chunked upload: ' + totalChunks + ' chunks');
-            
-            try {
-                for (let chunkIndex = 0; chunkIndex < totalChunks; chunkIndex++) {
-                    const start = chunkIndex * chunkSize;
-                    const end = Math.min(start + chunkSize, file.size);
-                    const chunk = file.slice(start, end);
-                    
-                    const formData = new FormData();
-                    formData.append('chunk', chunk);
-                    formData.append('chunkIndex', chunkIndex);
-                    formData.append('totalChunks', totalChunks);
-                    formData.append('fileId', fileId);
-                    formData.append('filename', file.name);
-                    
-                    // Update progress
-                    const chunkProgress = Math.round(((chunkIndex + 1) / totalChunks) * 100);
-                    progressFill.style.width = chunkProgress + '%';
-                    progressText.textContent = `Uploading chunk ${chunkIndex + 1}/${totalChunks}...`;
-                    
-                    // Upload chunk
-                    const response = await fetch('/upload-chunk', {
-                        method: 'POST',
-                        body: formData,
-                        credentials: 'include' // Send cookies
-                    });
-                    
-                    if (!response.ok) {
-                        if (response.status === 401 || response.status === 403) {
-                            pendingFile = file;
-                            showLoginModal();
-                            return;
-                        }
-                        const error = await response.json().catch(() => ({error: 'Upload failed'}));
-                        throw new Error(error.error || 'Chunk upload failed');
-                    }
-                    
-                    const result = await response.json();
-                    devLog('[UPLOAD] Chunk response:', result);
-                    
-                    // If this was the last chunk, server will process the file
-                    if (result.success && result.stats) {
-                        // Upload complete and processed
-                        uploadArea.classList.remove('uploading', 'error');
-                        uploadArea.classList.add('success');
-                        document.getElementById('uploadIcon').textContent = '✓';
-                        document.getElementById('uploadText').textContent = 'Upload Successful!';
-                        document.getElementById('uploadHint').textContent = result.message || 'Processing your conversations...';
-                        progressText.textContent = 'Loading your conversations...';
-                        progressFill.style.width = '100%';
-                        
-                        setTimeout(() => {
-                            window.location.reload();
-                        }, 1500);
-                        return;
-                    }
-                    
-                    // If last chunk uploaded, processing might take time
-                    if (chunkIndex === totalChunks - 1) {
-                        devLog('[UPLOAD] Last chunk uploaded, processing may take time for large files...');
-                        progressText.textContent = 'Processing file... This may take a moment.';
-                        
-                        // Wait a bit for processing, then reload
-                        // For very large files, processing might timeout on Vercel
-                        // So we'll reload after a delay and hope processing completed
-                        setTimeout(() => {
-                            devLog('[UPLOAD] Reloading page after processing delay...');
-                            window.location.reload();
-                        }, 15000); // Wait 15 seconds for processing
-                        return;
-                    }
-                }
-            } catch (error) {
-                devError('[UPLOAD] Chunked upload error:', error);
-                showUploadError('Upload failed: ' + error.message);
-            }
-        }
-        
-        // Background job processing - upload file, then poll for status
-        function uploadFileWithBackgroundProcessing(file) {
-            const formData = new FormData();
-            formData.append('file', file);
-            
-            const fileToUpload = file;
-            const xhr = new XMLHttpRequest();
-            const progressFill = document.getElementById('progressFill');
-            const progressText = document.getElementById('progressText');
-            
-            // CRITICAL: Set withCredentials to send cookies/session with request
-            xhr.withCredentials = true;
-            
-            // Track upload progress (0-50%, processing will be 50-100%)
-            xhr.upload.addEventListener('progress', function(e) {
-                if (e.lengthComputable) {
-                    const uploadPercent = Math.round((e.loaded / e.total) * 50);
-                    progressFill.style.width = uploadPercent + '%';
-                    progressText.textContent = Math.round((e.loaded / e.total) * 100) + '% uploaded';
-                }
-            });
-            
-            xhr.addEventListener('load', function() {
-                if (xhr.status === 200) {
-                    try {
-                        const response = JSON.parse(xhr.responseText);
-                        if (response.success && response.job_id) {
-                            devLog('[UPLOAD] File uploaded, job ID: ' + response.job_id);
-                            progressText.textContent = 'Processing file...';
-                            // Start polling for job status
-                            pollJobStatus(response.job_id);
-                        } else {
-                            showUploadError(response.error || 'Upload failed');
-                        }
-                    } catch (e) {
-                        devError('[UPLOAD] Failed to parse response:', e);
-                        showUploadError('Invalid response from server: ' + e.message);
-                    }
-                } else if (xhr.status === 401 || xhr.status === 403) {
-                    devLog('[UPLOAD] Authentication required (status: ' + xhr.status + ')');
-                    document.getElementById('uploadArea').classList.remove('uploading');
-                    pendingFile = fileToUpload;
-                    showLoginModal();
-                } else {
-                    try {
-                        const response = JSON.parse(xhr.responseText);
-                        showUploadError(response.error || 'Upload failed (status: ' + xhr.status + ')');
-                    } catch (e) {
-                        showUploadError('Upload failed: ' + xhr.statusText + ' (status: ' + xhr.status + ')');
-                    }
-                }
-            });
-            
-            xhr.addEventListener('error', function() {
-                devError('[UPLOAD] Network error during upload');
-                showUploadError('Network error. Please check your connection and try again.');
-            });
-            
-            xhr.open('POST', '/upload');
-            progressText.textContent = 'Uploading file...';
-            xhr.send(formData);
-        }
-        
-        // Poll job status
-        async function pollJobStatus(jobId) {
-            const progressFill = document.getElementById('progressFill');
-            const progressText = document.getElementById('progressText');
-            const uploadArea = document.getElementById('uploadArea');
-            let pollCount = 0;
-            const maxPolls = 300; // 5 minutes max (300 * 1 second)
-            
-            const poll = async () => {
-                try {
-                    const response = await fetch(`/upload-status/${jobId}`, {
-                        credentials: 'include'
-                    });
-                    
-                    if (!response.ok) {
-                        if (response.status === 401 || response.status === 403) {
-                            showLoginModal();
-                            return;
-                        }
-                        throw new Error('Status check failed: ' + response.status);
-                    }
-                    
-                    const status = await response.json();
-                    devLog('[UPLOAD] Job status:', status);
-                    
-                    // Update progress
-                    const progress = status.progress || 0;
-                    // Upload was 0-50%, so processing is 50-100%
-                    const totalProgress = 50 + (progress / 2);
-                    progressFill.style.width = totalProgress + '%';
-                    progressText.textContent = status.message || `Processing... ${progress}%`;
-                    
-                    if (status.status === 'completed') {
-                        // Success!
-                        uploadArea.classList.remove('uploading', 'error');
-                        uploadArea.classList.add('success');
-                        document.getElementById('uploadIcon').textContent = '✓';
-                        document.getElementById('uploadText').textContent = 'Upload Successful!';
-                        document.getElementById('uploadHint').textContent = status.message || 'Processing your conversations...';
-                        progressText.textContent = 'Loading your conversations...';
-                        progressFill.style.width = '100%';
-                        
-                        setTimeout(() => {
-                            window.location.reload();
-                        }, 1500);
-                        return;
-                    } else if (status.status === 'error') {
-                        showUploadError(status.error || 'Processing failed');
-                        return;
-                    } else if (status.status === 'processing' || status.status === 'queued') {
-                        // Continue polling
-                        pollCount++;
-                        if (pollCount >= maxPolls) {
-                            showUploadError('Processing is taking too long. Please try again or contact support.');
-                            return;
-                        }
-                        setTimeout(poll, 1000); // Poll every second
-                    }
-                } catch (error) {
-                    devError('[UPLOAD] Error polling job status:', error);
-                    // Continue polling on error (might be temporary)
-                    pollCount++;
-                    if (pollCount < maxPolls) {
-                        setTimeout(poll, 2000); // Wait 2 seconds on error
-                    } else {
-                        showUploadError('Failed to check processing status. Please refresh the page.');
-                    }
-                }
-            };
-            
-            // Start polling
-            poll();
-        }
-        
-        function showUploadError(message) {
-            console.error('[UPLOAD] showUploadError:', message);
-            const uploadArea = document.getElementById('uploadArea');
-            const uploadIcon = document.getElementById('uploadIcon');
-            const uploadText = document.getElementById('uploadText');
-            const uploadHint = document.getElementById('uploadHint');
-            const uploadProgress = document.getElementById('uploadProgress');
-            
-            uploadArea.classList.remove('uploading');
-            uploadArea.classList.add('error');
-            uploadIcon.textContent = '⚠️';
-            uploadText.textContent = 'Upload failed';
-            uploadHint.innerHTML = message + '<br><br>Click to try again';
-            uploadProgress.classList.add('hidden');
-            
-            // Reset after 5 seconds
-            setTimeout(() => {
-                console.log('[UPLOAD] Resetting upload area after error');
-                uploadArea.classList.remove('error');
-                uploadIcon.textContent = '📦';
-                uploadText.textContent = 'Drop your ChatGPT export ZIP file here';
-                uploadHint.textContent = 'Or click to browse • Accepts .zip or conversations.json';
-            }, 5000);
-        }
-        
-        function clearData() {
-            devLog('[DATA] clearData called');
-            if (confirm('Clear current data and upload a different file?')) {
-                console.log('[DATA] User confirmed, clearing data...');
-                fetch('/clear', { method: 'POST' })
-                    .then(r => {
-                        console.log('[DATA] /clear response status:', r.status);
-                        if (!r.ok) {
-                            throw new Error('Server returned ' + r.status);
-                        }
-                        return r.json();
-                    })
-                    .then(data => {
-                        console.log('[DATA] /clear response:', data);
-                        if (data.success) {
-                            console.log('[DATA] Data cleared, reloading...');
-                            window.location.reload();
-                        } else {
-                            alert('Failed to clear data: ' + (data.error || 'Unknown error'));
-                        }
-                    })
-                    .catch(err => {
-                        console.error('[DATA] Error clearing data:', err);
-                        alert('Error clearing data: ' + err.message);
-                    });
-            }
-        }
-        
-        // Tab switching
-        function switchTab(tabName) {
-            console.log('[UI] switchTab:', tabName);
-            // Update tab buttons
-            document.querySelectorAll('.tab-btn').forEach(btn => {
-                btn.classList.toggle('active', btn.dataset.tab === tabName);
-            });
-            
-            // Update tab content
-            document.querySelectorAll('.tab-content').forEach(content => {
-                content.classList.remove('active');
-            });
-            document.getElementById(tabName + 'Tab').classList.add('active');
-        }
-        
-        // View a specific project
-        function viewProject(projectId, projectName) {
-            console.log('[UI] viewProject:', projectId, projectName);
-            // Switch to conversations tab
-            switchTab('conversations');
-            
-            // Filter to this project
-            document.querySelectorAll('.project-item').forEach(item => {
-                item.classList.remove('active');
-                if (item.dataset.filter === projectId) {
-                    item.classList.add('active');
-                }
-            });
-            
-            document.getElementById('conversationsTitle').textContent = projectName;
-            filterConversations(projectId);
-        }
-        
-        // Project filter
-        document.querySelectorAll('.project-item').forEach(item => {
-            item.addEventListener('click', function() {
-                document.querySelectorAll('.project-item').forEach(i => i.classList.remove('active'));
-                this.classList.add('active');
-                
-                const filter = this.dataset.filter;
-                const title = this.querySelector('.project-name').textContent.trim();
-                document.getElementById('conversationsTitle').textContent = title.replace(/^[📚📁📄] /, '');
-                
-                filterConversations(filter);
-            });
-        });
-        
-        function filterConversations(filter) {
-            console.log('[UI] filterConversations:', filter);
-            const items = document.querySelectorAll('.conversation-item');
-            let visibleCount = 0;
-            items.forEach(item => {
-                if (filter === 'all') {
-                    item.style.display = '';
-                    visibleCount++;
-                } else if (filter === 'unassigned') {
-                    const show = item.dataset.project === 'unassigned';
-                    item.style.display = show ? '' : 'none';
-                    if (show) visibleCount++;
-                } else {
-                    const show = item.dataset.project === filter;
-                    item.style.display = show ? '' : 'none';
-                    if (show) visibleCount++;
-                }
-            });
-            console.log('[UI] Filter result:', visibleCount, 'visible conversations');
-        }
-        
-        function searchConversations() {
-            const query = document.getElementById('searchInput').value.toLowerCase();
-            console.log('[SEARCH] searchConversations:', query);
-            const items = document.querySelectorAll('.conversation-item');
-            let matchCount = 0;
-            
-            items.forEach(item => {
-                const title = item.querySelector('.conv-title').textContent.toLowerCase();
-                const preview = item.querySelector('.conv-preview').textContent.toLowerCase();
-                const matches = title.includes(query) || preview.includes(query);
-                item.style.display = matches ? '' : 'none';
-                if (matches) matchCount++;
-            });
-            console.log('[SEARCH] Found', matchCount, 'matches');
-        }
-        
-        document.getElementById('searchInput').addEventListener('keypress', function(e) {
-            if (e.key === 'Enter') searchConversations();
-        });
-        
-        function showConversation(id) {
-            console.log('[CONV] showConversation:', id);
-            fetch(`/conversation/${id}`)
-                .then(r => {
-                    console.log('[CONV] Response status:', r.status);
-                    return r.json();
-                })
-                .then(data => {
-                    console.log('[CONV] Loaded conversation:', data.title);
-                    console.log('[CONV] Messages count:', data.messages ? data.messages.length : 0);
-                    currentConversation = data;
-                    currentMarkdown = data.markdown;
-                    
-                    document.getElementById('modalTitle').textContent = data.title;
-                    
-                    let subtitle = [];
-                    if (data.project_name) subtitle.push(`Project: ${data.project_name}`);
-                    if (data.create_time) subtitle.push(`Created: ${data.create_time}`);
-                    if (data.model) subtitle.push(`Model: ${data.model}`);
-                    document.getElementById('modalSubtitle').textContent = subtitle.join(' • ');
-                    
-                    let messagesHtml = '';
-                    data.messages.forEach(msg => {
-                        const roleClass = msg.role === 'user' ? 'user' : 'assistant';
-                        const roleIcon = msg.role === 'user' ? '👤' : '🤖';
-                        messagesHtml += `
-                            <div class="message ${roleClass}">
-                                <div class="message-header">${roleIcon} ${msg.role.charAt(0).toUpperCase() + msg.role.slice(1)}</div>
-                                <div class="message-content">${escapeHtml(msg.content)}</div>
-                            </div>
-                        `;
-                    });
-                    
-                    document.getElementById('modalBody').innerHTML = messagesHtml;
-                    document.getElementById('modalOverlay').classList.add('active');
-                })
-                .catch(err => {
-                    console.error('[CONV] Error loading conversation:', err);
-                    showToast('Failed to load conversation');
-                });
-        }
-        
-        function closeModal(event) {
-            console.log('[UI] closeModal called');
-            if (!event || event.target === document.getElementById('modalOverlay')) {
-                document.getElementById('modalOverlay').classList.remove('active');
-            }
-        }
-        
-        function copyToClipboard() {
-            console.log('[UI] copyToClipboard, markdown length:', currentMarkdown ? currentMarkdown.length : 0);
-            navigator.clipboard.writeText(currentMarkdown).then(() => {
-                console.log('[UI] Copied to clipboard successfully');
-                showToast('Copied to clipboard!');
-            }).catch(err => {
-                console.error('[UI] Copy to clipboard failed:', err);
-                showToast('Failed to copy');
-            });
-        }
-        
-        function showToast(message) {
-            console.log('[UI] showToast:', message);
-            const toast = document.getElementById('toast');
-            toast.textContent = message;
-            toast.classList.add('show');
-            setTimeout(() => toast.classList.remove('show'), 2500);
-        }
-        
-        function escapeHtml(text) {
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
-        }
-        
-        function exportAll() {
-            console.log('[EXPORT] exportAll called');
-            window.location.href = '/export-all';
-        }
-        
-        // Keyboard shortcuts
-        document.addEventListener('keydown', function(e) {
-            if (e.key === 'Escape') closeModal();
-        });
-        
-        // Smart Groups functionality
-        let smartGroups = JSON.parse(localStorage.getItem('otc_smart_groups') || '[]');
-        console.log('[SMART] Loaded', smartGroups.length, 'smart groups from localStorage');
-        let allConversations = [];
-        
-        // Load conversation data
-        document.addEventListener('DOMContentLoaded', function() {
-            console.log('[INIT] DOMContentLoaded - loading conversation data');
-            // Get all conversation items
-            document.querySelectorAll('.conversation-item').forEach(item => {
-                allConversations.push({
-                    id: item.dataset.id,
-                    title: item.querySelector('.conv-title').textContent,
-                    project: item.dataset.project
-                });
-            });
-            console.log('[INIT] Loaded', allConversations.length, 'conversations');
-            
-            renderSmartGroups();
-            generateSuggestedGroups();
-            initKeywordAutocomplete();
-        });
-        
-        // Keyword autocomplete for Smart Groups
-        function initKeywordAutocomplete() {
-            const keywordInput = document.getElementById('groupKeywords');
-            const dropdown = document.getElementById('keywordDropdown');
-            if (!keywordInput || !dropdown) return;
-            
-            let timeout;
-            
-            keywordInput.addEventListener('input', function() {
-                clearTimeout(timeout);
-                const value = this.value;
-                const lastKeyword = value.split(',').pop().trim().toLowerCase();
-                
-                if (lastKeyword.length < 2) {
-                    dropdown.classList.remove('active');
-                    return;
-                }
-                
-                timeout = setTimeout(() => {
-                    showKeywordSuggestions(lastKeyword, dropdown);
-                }, 100);
-            });
-            
-            keywordInput.addEventListener('focus', function() {
-                const value = this.value;
-                const lastKeyword = value.split(',').pop().trim().toLowerCase();
-                if (lastKeyword.length >= 2) {
-                    showKeywordSuggestions(lastKeyword, dropdown);
-                }
-            });
-            
-            document.addEventListener('click', function(e) {
-                if (!e.target.closest('.autocomplete-wrapper')) {
-                    dropdown.classList.remove('active');
-                }
-            });
-            
-            keywordInput.addEventListener('keydown', function(e) {
-                if (e.key === 'Escape') {
-                    dropdown.classList.remove('active');
-                }
-            });
-        }
-        
-        function showKeywordSuggestions(query, dropdown) {
-            // Find matching conversation titles
-            const matches = allConversations.filter(conv => 
-                conv.title.toLowerCase().includes(query)
-            ).slice(0, 8);
-            
-            // Extract unique words from matching titles
-            const wordMatches = new Map();
-            matches.forEach(conv => {
-                const words = conv.title.toLowerCase().split(/\s+/);
-                words.forEach(word => {
-                    word = word.replace(/[^a-z0-9]/g, '');
-                    if (word.includes(query) && word.length > 2) {
-                        if (!wordMatches.has(word)) {
-                            wordMatches.set(word, conv.title);
-                        }
-                    }
-                });
-            });
-            
-            if (wordMatches.size === 0 && matches.length === 0) {
-                dropdown.innerHTML = '<div style="padding: 0.75rem; color: var(--text-muted); font-size: 0.8125rem;">No matches found</div>';
-            } else {
-                let html = '';
-                
-                // Show word matches first
-                wordMatches.forEach((title, word) => {
-                    html += `
-                        <div class="autocomplete-item" onclick="addKeyword('${word}')">
-                            <div class="autocomplete-match">${word}</div>
-                            <div class="autocomplete-title">from: ${title}</div>
-                        </div>
-                    `;
-                });
-                
-                dropdown.innerHTML = html || '<div style="padding: 0.75rem; color: var(--text-muted); font-size: 0.8125rem;">No matches</div>';
-            }
-            
-            dropdown.classList.add('active');
-        }
-        
-        function addKeyword(word) {
-            const input = document.getElementById('groupKeywords');
-            const currentValue = input.value;
-            const parts = currentValue.split(',').map(p => p.trim()).filter(p => p);
-            
-            // Remove the partial keyword being typed
-            if (parts.length > 0) {
-                parts.pop();
-            }
-            parts.push(word);
-            
-            input.value = parts.join(', ') + ', ';
-            input.focus();
-            document.getElementById('keywordDropdown').classList.remove('active');
-        }
-        
-        function createSmartGroup() {
-            console.log('[SMART] createSmartGroup called');
-            const name = document.getElementById('groupName').value.trim();
-            const keywords = document.getElementById('groupKeywords').value.trim();
-            console.log('[SMART] Name:', name, 'Keywords:', keywords);
-            
-            if (!name || !keywords) {
-                console.log('[SMART] Missing name or keywords');
-                showToast('Please enter both name and keywords');
-                return;
-            }
-            
-            const keywordList = keywords.split(',').map(k => k.trim().toLowerCase()).filter(k => k);
-            console.log('[SMART] Keyword list:', keywordList);
-            
-            const group = {
-                id: 'smart_' + Date.now(),
-                name: name,
-                keywords: keywordList,
-                icon: '📂'
-            };
-            
-            smartGroups.push(group);
-            localStorage.setItem('otc_smart_groups', JSON.stringify(smartGroups));
-            console.log('[SMART] Group saved, total groups:', smartGroups.length);
-            
-            document.getElementById('groupName').value = '';
-            document.getElementById('groupKeywords').value = '';
-            
-            renderSmartGroups();
-            showToast(`Created group "${name}"`);
-        }
-        
-        function renderSmartGroups() {
-            console.log('[SMART] renderSmartGroups, groups count:', smartGroups.length);
-            const container = document.getElementById('smartGroupsList');
-            if (!container) {
-                console.log('[SMART] Smart groups container not found (might be on landing page)');
-                return;
-            }
-            container.innerHTML = '';
-            
-            smartGroups.forEach(group => {
-                const matches = allConversations.filter(conv => 
-                    group.keywords.some(kw => conv.title.toLowerCase().includes(kw))
-                );
-                console.log('[SMART] Group', group.name, 'has', matches.length, 'matches');
-                
-                const card = document.createElement('div');
-                card.className = 'project-card';
-                card.onclick = () => viewSmartGroup(group);
-                card.innerHTML = `
-                    <div style="display: flex; justify-content: space-between; align-items: flex-start;">
-                        <div class="project-card-icon">${group.icon}</div>
-                        <button onclick="event.stopPropagation(); deleteSmartGroup('${group.id}')" 
-                            style="background: none; border: none; color: var(--text-muted); cursor: pointer; font-size: 1.2rem;">✕</button>
-                    </div>
-                    <h3 class="project-card-title">${group.name}</h3>
-                    <div class="project-card-stats">
-                        <div class="project-card-stat">
-                            <div class="project-card-stat-value">${matches.length}</div>
-                            <div class="project-card-stat-label">Matches</div>
-                        </div>
-                    </div>
-                    <div class="project-card-recent" style="color: var(--text-muted);">
-                        Keywords: ${group.keywords.join(', ')}
-                    </div>
-                `;
-                container.appendChild(card);
-            });
-            
-            if (smartGroups.length === 0) {
-                container.innerHTML = `
-                    <div style="grid-column: 1 / -1; text-align: center; padding: 2rem; color: var(--text-muted);">
-                        <p>No smart groups yet. Create one above!</p>
-                        <p style="margin-top: 0.5rem; font-size: 0.9rem;">
-                            Try creating groups like "Emails" with keywords "[company name], [project name], [client name], etc"
-                        </p>
-                    </div>
-                `;
-            }
-        }
-        
-        function deleteSmartGroup(groupId) {
-            console.log('[SMART] deleteSmartGroup:', groupId);
-            smartGroups = smartGroups.filter(g => g.id !== groupId);
-            localStorage.setItem('otc_smart_groups', JSON.stringify(smartGroups));
-            renderSmartGroups();
-            showToast('Group deleted');
-        }
-        
-        function viewSmartGroup(group) {
-            console.log('[SMART] viewSmartGroup:', group.name);
-            switchTab('conversations');
-            
-            document.querySelectorAll('.project-item').forEach(item => item.classList.remove('active'));
-            document.getElementById('conversationsTitle').textContent = group.name;
-            
-            // Filter conversations by keywords
-            const items = document.querySelectorAll('.conversation-item');
-            let matchCount = 0;
-            items.forEach(item => {
-                const title = item.querySelector('.conv-title').textContent.toLowerCase();
-                const matches = group.keywords.some(kw => title.includes(kw));
-                item.style.display = matches ? '' : 'none';
-                if (matches) matchCount++;
-            });
-            console.log('[SMART] Showing', matchCount, 'conversations for group', group.name);
-        }
-        
-        function generateSuggestedGroups() {
-            const container = document.getElementById('suggestedGroups');
-            
-            // Analyze conversation titles to find common words
-            const wordCounts = {};
-            const stopWords = ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'new', 'chat', 'help', 'how', 'what', 'why', 'when', 'where', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'shall', 'can', 'need', 'make', 'made', 'get', 'got', 'this', 'that', 'these', 'those', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'us', 'them', 'using', 'code', 'app'];
-            
-            allConversations.forEach(conv => {
-                const words = conv.title.toLowerCase().split(/\\s+/);
-                words.forEach(word => {
-                    word = word.replace(/[^a-z0-9]/g, '');
-                    if (word.length > 3 && !stopWords.includes(word)) {
-                        wordCounts[word] = (wordCounts[word] || 0) + 1;
-                    }
-                });
-            });
-            
-            // Get top keywords that appear in multiple conversations
-            const suggestions = Object.entries(wordCounts)
-                .filter(([word, count]) => count >= 3)
-                .sort((a, b) => b[1] - a[1])
-                .slice(0, 8);
-            
-            if (suggestions.length === 0) {
-                container.innerHTML = '<p style="color: var(--text-muted); grid-column: 1 / -1;">No suggestions available yet.</p>';
-                return;
-            }
-            
-            container.innerHTML = suggestions.map(([word, count]) => `
-                <div class="project-card" onclick="suggestGroup('${word}')" style="cursor: pointer;">
-                    <div class="project-card-icon">💡</div>
-                    <h3 class="project-card-title" style="text-transform: capitalize;">${word}</h3>
-                    <div class="project-card-stats">
-                        <div class="project-card-stat">
-                            <div class="project-card-stat-value">${count}</div>
-                            <div class="project-card-stat-label">Matches</div>
-                        </div>
-                    </div>
-                    <div class="project-card-recent">Click to create group</div>
-                </div>
-            `).join('');
-        }
-        
-        function suggestGroup(keyword) {
-            document.getElementById('groupName').value = keyword.charAt(0).toUpperCase() + keyword.slice(1);
-            document.getElementById('groupKeywords').value = keyword;
-            document.getElementById('groupName').focus();
-            showToast('Edit the group name and keywords, then click Create');
-        }
-        
+        // Production mode check, shared with the scripts below
+        const IS_PRODUCTION = {{ 'true' if IS_PRODUCTION else 'false' }};
     </script>
+    <script src="{{ asset_urls['js/app.js'] }}"></script>
     
     <!-- Site Footer (reusable component) -->
     <footer class="site-footer">
@@ -3740,189 +2875,96 @@ HTML_TEMPLATE = r"""
     </div>
     
     <!-- Firebase Authentication Script - ISOLATED from file processing -->
-    <script>
-        // Production mode check
-        const IS_PRODUCTION = {{ 'true' if IS_PRODUCTION else 'false' }};
-        
-        // Console logging wrapper - only log in development
-        const devLog = IS_PRODUCTION ? () => {} : console.log.bind(console);
-        const devError = console.error.bind(console); // Always log errors
-        
-        // Local-only mode: authentication disabled, everything runs offline
-        let firebaseApp = null;
-        let currentUser = null;
-        let pendingFile = null;
+    <script src="{{ asset_urls['js/auth.js'] }}"></script>
+</body>
+</html>
+"""
 
-        async function initFirebase() {
-            devLog('[AUTH] Firebase disabled (local-only mode)');
-            return;
-        }
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# Asset names are not content-hashed, so plain URLs are cached for a day and
+# revalidated via ETag/Last-Modified; URLs carrying a ?v= content hash (see
+# _versioned_static_url) can be cached for a year
+STATIC_MAX_AGE = 24 * 60 * 60
+STATIC_VERSIONED_MAX_AGE = 365 * 24 * 60 * 60
 
-        async function checkAuthStatus() {
-            // Always allow in local-only mode
-            return { authenticated: true };
-        }
-        
-        async function requireAuthForUpload() {
-            return true;
-        }
 
-        // Show login modal
-        function showLoginModal() {
-            devLog('[AUTH] showLoginModal called');
-            const modal = document.getElementById('loginModalOverlay');
-            devLog('[AUTH] Modal element:', modal);
-            if (modal) {
-                modal.classList.add('active');
-                devLog('[AUTH] Login modal shown');
-            } else {
-                devError('[AUTH] Login modal element not found!');
-            }
-        }
+def _versioned_static_url(filename):
+    """Static URL with a short content hash so a changed file gets a new URL"""
+    with open(os.path.join(STATIC_DIR, filename), 'rb') as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:12]
+    return f"/static/{filename}?v={digest}"
 
-        // Close login modal
-        function closeLoginModal(event) {
-            console.log('[AUTH] closeLoginModal called');
-            if (!event || event.target === document.getElementById('loginModalOverlay')) {
-                document.getElementById('loginModalOverlay').classList.remove('active');
-            }
-        }
 
-        // Convert technical Firebase errors to user-friendly messages
-        function getUserFriendlyError(error) {
-            if (!error) return 'Something went wrong. Please try again.';
-            
-            const errorCode = error.code || '';
-            const errorMessage = error.message || String(error);
-            
-            // Map Firebase error codes to friendly messages
-            const errorMap = {
-                'auth/internal-error': 'There was a problem with the sign-in service. Please try again in a moment.',
-                'auth/network-request-failed': 'Network error. Please check your internet connection and try again.',
-                'auth/popup-closed-by-user': 'Sign-in was cancelled. Please try again if you want to continue.',
-                'auth/popup-blocked': 'The sign-in popup was blocked. Please allow popups for this site and try again.',
-                'auth/cancelled-popup-request': 'Another sign-in attempt is already in progress. Please wait.',
-                'auth/unauthorized-domain': 'This domain is not authorized. Please contact support.',
-                'auth/invalid-api-key': 'Configuration error. Please contact support.',
-                'auth/operation-not-allowed': 'Sign-in method is not enabled. Please contact support.',
-                'auth/too-many-requests': 'Too many sign-in attempts. Please wait a few minutes and try again.',
-                'auth/user-disabled': 'This account has been disabled. Please contact support.',
-                'auth/user-not-found': 'Account not found. Please try a different account.',
-                'auth/wrong-password': 'Incorrect password. Please try again.',
-                'auth/email-already-in-use': 'This email is already in use. Please try a different account.',
-                'auth/weak-password': 'Password is too weak. Please use a stronger password.',
-                'auth/invalid-email': 'Invalid email address. Please check and try again.',
-                'auth/account-exists-with-different-credential': 'An account with this email already exists. Please use a different sign-in method.'
-            };
-            
-            // Check if we have a mapped message
-            if (errorCode && errorMap[errorCode]) {
-                return errorMap[errorCode];
-            }
-            
-            // For production, show generic message; for development, show actual error
-            if (IS_PRODUCTION) {
-                // In production, hide technical details
-                if (errorCode && errorCode.startsWith('auth/')) {
-                    return 'Sign-in failed. Please try again or contact support if the problem persists.';
-                }
-                return 'Something went wrong. Please try again.';
-            } else {
-                // In development, show the actual error for debugging
-                return errorMessage;
-            }
-        }
+_ASSET_URLS = {name: _versioned_static_url(name) for name in ('js/app.js', 'js/auth.js')}
 
-        // Local-only sign-in stub (no auth required)
-        async function signInWithGoogle() {
-            devLog('[AUTH] Sign-in skipped (local-only mode)');
-            const overlay = document.getElementById('loginModalOverlay');
-            if (overlay) overlay.classList.remove('active');
-            return true;
-        }
-
-        // Update UI - NO Firebase dependency
-        function updateUserUI(user) {
-            const headerActions = document.getElementById('headerActions');
-            if (headerActions && user) {
-                const avatarHtml = user.photoURL ? 
-                    `<img src="${user.photoURL}" alt="${user.name}" class="user-avatar" onerror="this.style.display='none'">` : '';
-                headerActions.innerHTML = `
-                    <div class="user-info">
-                        ${avatarHtml}
-                        <span>${user.name || user.email}</span>
-                        <button onclick="signOut()" class="logout-btn">Logout</button>
-                    </div>
-                    <button onclick="clearData()" class="header-action-btn">
-                        ↻ Load Different Data
-                    </button>
-                `;
-            }
-        }
+# Compiled once at import; index() only renders. The empty state never changes,
+# so it is rendered up front as well.
+_INDEX_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE, globals={'asset_urls': _ASSET_URLS})
+_EMPTY_INDEX_HTML = None if _IN_EXPORT_WORKER else _INDEX_TEMPLATE.render(parser=None, IS_PRODUCTION=IS_PRODUCTION)
 
-        // Sign out - NO Firebase dependency after initial signout
-        async function signOut() {
-            await fetch('/logout', { method: 'POST' }).catch(() => {});
-            currentUser = null;
-            window.location.reload();
-        }
 
-        function waitForFirebase() {
-            document.body.style.display = 'block';
-        }
-        
-        // Global error handler to prevent white screen
-        window.addEventListener('error', function(e) {
-            console.error('[GLOBAL ERROR]', e.error, e.message, e.filename, e.lineno);
-            // Ensure page is visible even if there's an error
-            document.body.style.display = 'block';
-            document.body.style.visibility = 'visible';
-        });
-        
-        // Initialize on page load with error handling
-        try {
-            if (document.readyState === 'loading') {
-                document.addEventListener('DOMContentLoaded', function() {
-                    try {
-                        waitForFirebase();
-                    } catch (e) {
-                        console.error('[INIT ERROR]', e);
-                        // Show page even if initialization fails
-                        document.body.style.display = 'block';
-                    }
-                });
-            } else {
-                try {
-                    waitForFirebase();
-                } catch (e) {
-                    console.error('[INIT ERROR]', e);
-                    document.body.style.display = 'block';
-                }
-            }
-        } catch (e) {
-            console.error('[CRITICAL INIT ERROR]', e);
-            // Ensure page is visible
-            document.body.style.display = 'block';
-            document.body.style.visibility = 'visible';
-        }
-    </script>
-</body>
-</html>
-"""
 
 
+# Parsed stored files: path -> (mtime, size, parser), least recently used first.
+# Keyed by path so a rewritten file replaces its old parser, and entries are
+# evicted as soon as their file is deleted rather than lingering in memory.
+# Bounded by count and by the stored files' total size (a parsed export, plus
+# its search index, takes a few times its file size in memory).
+PARSER_CACHE_SIZE = int(os.environ.get('PARSER_CACHE_SIZE', '4'))
+PARSER_CACHE_MAX_BYTES = int(os.environ.get('PARSER_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+_parser_cache = {}
+_parser_cache_lock = threading.Lock()
+
+
+def _evict_parser(path):
+    """Drop the cached parser for a stored file that is being removed"""
+    with _parser_cache_lock:
+        _parser_cache.pop(path, None)
+
+
+def _load_parser_cached(path, mtime, size):
+    """Return the parser for a stored conversations file, parsing it once per mtime"""
+    with _parser_cache_lock:
+        hit = _parser_cache.pop(path, None)
+        if hit is not None and hit[0] == mtime:
+            _parser_cache[path] = hit  # Re-insert as most recently used
+            return hit[2]
+    
+    loaded = _parse_stored_file(path)
+    with _parser_cache_lock:
+        _parser_cache[path] = (mtime, size, loaded)
+        total = sum(entry[1] for entry in _parser_cache.values())
+        # Evict least recently used, but always keep the parser just loaded
+        while len(_parser_cache) > 1 and (len(_parser_cache) > PARSER_CACHE_SIZE or total > PARSER_CACHE_MAX_BYTES):
+            total -= _parser_cache.pop(next(iter(_parser_cache)))[1]
+    return loaded
+
+
+def _parse_stored_file(path):
+    """Parse a stored conversations file into a new ChatGPTParser"""
+    loaded = ChatGPTParser()
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            # Stream so the full decoded list never sits in memory next to the parser
+            loaded.parse_from_stream(f)
+            return loaded
+        raw = f.read()
+    conversations_data = _json_loads(raw)
+    logger.info(f"Loaded {len(conversations_data) if isinstance(conversations_data, list) else 'unknown'} conversations from file")
+    loaded.parse_from_json(conversations_data)
+    return loaded
 
 
 def get_parser_from_session():
     """Helper function to load parser from file-based storage with expiration check"""
-    global parser
     storage_file = session.get('conversations_file', None)
     expires_at = session.get('conversations_expires_at', 0)
     
     # Check expiration from session
     if expires_at > 0 and time.time() > expires_at:
         logger.info("Session data expired, clearing")
-        if storage_file and os.path.exists(storage_file):
+        if storage_file:
+            _evict_parser(storage_file)
             try:
                 os.remove(storage_file)
             except:
@@ -3935,11 +2977,18 @@ def get_parser_from_session():
     
     # Load from file storage
     if storage_file:
-        if os.path.exists(storage_file):
+        # One stat gives both existence and mtime
+        try:
+            st = os.stat(storage_file)
+        except OSError:
+            st = None
+        
+        if st is not None:
             # Check file age (double-check expiration)
-            file_age = time.time() - os.path.getmtime(storage_file)
+            file_age = time.time() - st.st_mtime
             if file_age > EPHEMERAL_TTL:
                 logger.info(f"File expired (age: {file_age}s), removing")
+                _evict_parser(storage_file)
                 try:
                     os.remove(storage_file)
                 except:
@@ -3950,12 +2999,7 @@ def get_parser_from_session():
             
             try:
                 logger.info(f"Loading conversations from file: {storage_file}")
-                with open(storage_file, 'r', encoding='utf-8') as f:
-                    conversations_data = json.load(f)
-                
-                logger.info(f"Loaded {len(conversations_data) if isinstance(conversations_data, list) else 'unknown'} conversations from file")
-                parser = ChatGPTParser()
-                parser.parse_from_json(conversations_data)
+                parser = _load_parser_cached(storage_file, st.st_mtime, st.st_size)
                 logger.info(f"Parser initialized with {len(parser.conversations)} conversations")
                 return parser
             except Exception as e:
@@ -3963,14 +3007,14 @@ def get_parser_from_session():
                 parser = None
                 # Clean up invalid file
                 try:
-                    if os.path.exists(storage_file):
-                        os.remove(storage_file)
+                    os.remove(storage_file)
                 except:
                     pass
                 session.pop('conversations_file', None)
                 session.pop('conversations_expires_at', None)
         else:
             logger.warning(f"Storage file not found: {storage_file}")
+            _evict_parser(storage_file)
             # File doesn't exist - clear from session
             session.pop('conversations_file', None)
             session.pop('conversations_expires_at', None)
@@ -3983,11 +3027,11 @@ def get_parser_from_session():
             parser.parse_from_json(conversations_data)
             # Migrate to file storage
             session_id = session.get('_id', secrets.token_hex(16))
-            file_id = hashlib.md5(f"{session_id}_{time.time()}".encode()).hexdigest()
+            file_id = secrets.token_hex(16)
             storage_file = os.path.join(STORAGE_DIR, f'{session_id}_conv_{file_id}.json')  # Add session prefix
             expires_at = time.time() + EPHEMERAL_TTL
-            with open(storage_file, 'w', encoding='utf-8') as f:
-                json.dump(conversations_data, f)
+            with open(storage_file, 'wb') as f:
+                f.write(_json_dumps(conversations_data))
             session['conversations_file'] = storage_file
             session['conversations_expires_at'] = expires_at  # Add expiration
             session.pop('conversations_data', None)  # Remove from session
@@ -4004,8 +3048,6 @@ def get_parser_from_session():
 @app.route('/')
 def index():
     try:
-        global parser
-        
         # Log session info for debugging
         storage_file = session.get('conversations_file', None)
         logger.info(f"Index route - Session ID: {session.get('_id', 'no-id')}")
@@ -4017,10 +3059,9 @@ def index():
         parser = get_parser_from_session()
         
         if parser:
-            stats = parser.get_stats()
+            stats = parser.stats
             logger.info(f"Index route - Loaded {stats['total_conversations']} conversations")
-            return render_template_string(
-                HTML_TEMPLATE,
+            return _INDEX_TEMPLATE.render(
                 parser=parser,
                 stats=stats,
                 projects=list(parser.projects.values()),
@@ -4030,31 +3071,70 @@ def index():
             )
         
         logger.info("Index route - No parser loaded, showing empty state")
-        return render_template_string(
-            HTML_TEMPLATE, 
-            parser=None,
-            IS_PRODUCTION=IS_PRODUCTION
-        )
+        return _EMPTY_INDEX_HTML
     except Exception as e:
         logger.exception(f"Error in index route: {e}")
         return f"<html><body><h1>Error</h1><p>{str(e)}</p><pre>{traceback.format_exc()}</pre></body></html>", 500
 
 
+# Small static files kept in memory after first use: path -> (bytes, mtime, etag).
+# Keyed by the normalized path so spellings like js/./app.js share one entry, and
+# capped in total size. Populated without a lock; a race only means the same
+# file is read twice.
+_STATIC_CACHE = {}
+STATIC_CACHE_MAX_BYTES = 1024 * 1024
+STATIC_CACHE_MAX_TOTAL_BYTES = 8 * 1024 * 1024
+
+
+def _cached_static_file(filename):
+    """Return cached (bytes, mtime, etag) for a small static file, or None"""
+    path = safe_join(STATIC_DIR, filename)
+    if path is None:
+        return None
+    entry = _STATIC_CACHE.get(path)
+    if entry is not None:
+        return entry
+    if sum(len(cached[0]) for cached in _STATIC_CACHE.values()) >= STATIC_CACHE_MAX_TOTAL_BYTES:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode) or st.st_size > STATIC_CACHE_MAX_BYTES:
+        return None
+    with open(path, 'rb') as f:
+        data = f.read()
+    entry = (data, st.st_mtime, hashlib.md5(data).hexdigest())
+    _STATIC_CACHE[path] = entry
+    return entry
+
+
 @app.route('/static/<path:filename>')
 def serve_static(filename):
     """Serve static files from the app directory"""
-    import os
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    static_path = os.path.join(base_dir, 'static', filename)
-    
-    # Security: prevent directory traversal
-    if not os.path.abspath(static_path).startswith(os.path.abspath(os.path.join(base_dir, 'static'))):
-        return "Forbidden", 403
-    
-    if not os.path.exists(static_path):
-        return "Not Found", 404
+    versioned = bool(request.args.get('v'))
+    max_age = STATIC_VERSIONED_MAX_AGE if versioned else STATIC_MAX_AGE
+    
+    # Debug mode reads from disk every time so edits show up without a restart
+    entry = None if app.debug else _cached_static_file(filename)
+    if entry is not None:
+        data, mtime, etag = entry
+        response = send_file(
+            BytesIO(data),
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            conditional=True,
+            etag=etag,
+            last_modified=mtime,
+            max_age=max_age
+        )
+    else:
+        # send_from_directory rejects paths that escape STATIC_DIR (404) and
+        # answers If-None-Match / If-Modified-Since with 304
+        response = send_from_directory(STATIC_DIR, filename, conditional=True, max_age=max_age)
     
-    return send_file(static_path)
+    if versioned:
+        response.cache_control.immutable = True
+    return response
 
 
 @app.route('/login', methods=['POST'])
@@ -4077,14 +3157,107 @@ def logout():
     return jsonify({"success": True})
 
 
+# Local-only mode: the auth status never changes, so the body and its ETag are
+# built once and repeat requests can be answered with 304 Not Modified.
+_AUTH_STATUS_BODY = json.dumps({
+    "authenticated": False,
+    "user": None,
+    "firebase_configured": False
+})
+_AUTH_STATUS_ETAG = hashlib.md5(_AUTH_STATUS_BODY.encode()).hexdigest()
+
+
 @app.route('/auth/status')
 def auth_status():
     """Local-only mode: authentication is disabled."""
-    return jsonify({
-        "authenticated": False,
-        "user": None,
-        "firebase_configured": False
-    })
+    response = app.response_class(_AUTH_STATUS_BODY, mimetype='application/json')
+    response.set_etag(_AUTH_STATUS_ETAG, weak=True)
+    response.headers['Cache-Control'] = 'private, max-age=300'
+    return response.make_conditional(request)
+
+
+# Linux can copy file-to-file inside the kernel; other platforms (e.g. macOS,
+# where sendfile needs a socket) use a buffered copy
+_USE_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def _copy_with_buffer(infile, outfile, buf):
+    """Copy infile to outfile through the reusable bytearray buf"""
+    view = memoryview(buf)
+    while True:
+        n = infile.readinto(buf)
+        if not n:
+            break
+        outfile.write(view[:n])
+
+
+def _append_file(outfile, chunk_path, buf):
+    """Append chunk_path to the open binary file outfile without reading it into Python"""
+    with open(chunk_path, 'rb') as infile:
+        if _USE_SENDFILE:
+            # sendfile writes to the fd directly: push out anything a previous
+            # buffered fallback left in outfile first, or it would land after this chunk
+            outfile.flush()
+            out_fd = outfile.fileno()
+            in_fd = infile.fileno()
+            remaining = os.fstat(in_fd).st_size
+            try:
+                while remaining > 0:
+                    sent = os.sendfile(out_fd, in_fd, None, remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+                if remaining == 0:
+                    return
+            except OSError:
+                pass
+            # Finish whatever sendfile didn't (in_fd's offset tracks progress)
+        _copy_with_buffer(infile, outfile, buf)
+
+
+class _MappedFile(mmap.mmap):
+    """Read-only mmap usable as a zipfile source (mmap only gained seekable() in 3.13)"""
+
+    def seekable(self):
+        return True
+
+    def seek(self, pos, whence=0):
+        # Files raise OSError for a seek before the start, which zipfile expects
+        # when probing a file too short to be a ZIP; mmap raises ValueError
+        try:
+            return super().seek(pos, whence)
+        except ValueError as e:
+            raise OSError(str(e)) from e
+
+
+def _save_upload(storage, dest_path):
+    """Save an uploaded FileStorage, using sendfile when Werkzeug spooled it to disk"""
+    stream = storage.stream
+    # Only a SpooledTemporaryFile that has rolled over has a real fd; calling
+    # fileno() on one still in memory would force it to disk first
+    if _USE_SENDFILE and getattr(stream, '_rolled', True):
+        try:
+            stream.flush()
+            in_fd = stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            in_fd = None
+        if in_fd is not None:
+            offset = stream.tell()
+            size = os.fstat(in_fd).st_size
+            try:
+                with open(dest_path, 'wb') as outfile:
+                    out_fd = outfile.fileno()
+                    while offset < size:
+                        sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                if offset >= size:
+                    return
+            except OSError:
+                pass
+    storage.save(dest_path, COPY_BUFFER_SIZE)
 
 
 @app.route('/upload-chunk', methods=['POST'])
@@ -4101,37 +3274,48 @@ def upload_chunk():
         if not chunk or not file_id:
             return jsonify({"error": "Missing chunk or fileId"}), 400
         
-        # Store chunk in temp directory
-        session_id = session.get('_id', secrets.token_hex(16))
+        # Store chunk in temp directory (created by whichever chunk arrives first)
         chunks_dir = os.path.join(STORAGE_DIR, 'chunks', file_id)
-        os.makedirs(chunks_dir, exist_ok=True)
-        
         chunk_path = os.path.join(chunks_dir, f'chunk_{chunk_index}')
-        chunk.save(chunk_path)
+        try:
+            _save_upload(chunk, chunk_path)
+        except FileNotFoundError:
+            os.makedirs(chunks_dir, exist_ok=True)
+            _save_upload(chunk, chunk_path)
         
         logger.info(f"Received chunk {chunk_index + 1}/{total_chunks} for file {file_id}")
         
-        # Check if all chunks received
-        received_chunks = len([f for f in os.listdir(chunks_dir) if f.startswith('chunk_')])
+        # Check if all chunks received (the names are reused for reassembly)
+        with os.scandir(chunks_dir) as entries:
+            chunk_names = [entry.name for entry in entries if entry.name.startswith('chunk_')]
+        received_chunks = len(chunk_names)
         
         if received_chunks == total_chunks:
-            # All chunks received - reassemble file
-            logger.info(f"All chunks received for {file_id}, reassembling and processing...")
-            try:
-                # Process synchronously - this might take time for large files
-                # Vercel timeout is 60s for Pro, 10s for Hobby
-                result = reassemble_and_process_file(chunks_dir, file_id, filename)
-                logger.info(f"File processing complete for {file_id}")
-                return result
-            except Exception as e:
-                logger.exception(f"Error processing file {file_id}: {e}")
-                # Clean up chunks on error
-                try:
-                    import shutil
-                    shutil.rmtree(chunks_dir)
-                except:
-                    pass
-                return jsonify({"error": f"Error processing file: {str(e)}"}), 500
+            # All chunks received - reassemble and process in the background
+            # (the client polls /upload-status, like a regular upload)
+            logger.info(f"All chunks received for {file_id}, starting background reassembly...")
+            session_id = session.get('_id', secrets.token_hex(16))
+            job_id = secrets.token_hex(16)
+            expires_at = time.time() + EPHEMERAL_TTL
+            with job_lock:
+                processing_jobs[job_id] = {
+                    "status": "queued",
+                    "progress": 0,
+                    "message": "All chunks received, reassembling file...",
+                    "session_id": session_id,
+                    "user_id": session.get('user_id'),
+                    "created_at": time.time(),
+                    "expires_at": expires_at
+                }
+            job_executor.submit(reassemble_and_process_file, job_id, chunks_dir, filename, chunk_names, session_id)
+            return jsonify({
+                "success": True,
+                "job_id": job_id,
+                "status": "processing",
+                "expires_at": expires_at,
+                "expires_in": int(EPHEMERAL_TTL),
+                "message": "File uploaded successfully. Processing in background..."
+            })
         else:
             return jsonify({
                 "success": True,
@@ -4146,24 +3330,74 @@ def upload_chunk():
         return jsonify({"error": f"Error uploading chunk: {str(e)}"}), 500
 
 
-def reassemble_and_process_file(chunks_dir, file_id, filename):
-    """Reassemble chunks into file and process it"""
-    global parser
-    
+@contextmanager
+def _open_zip(file_path):
+    """Open a ZIP read-only over an mmap so only the pages zipfile touches are read in"""
+    with open(file_path, 'rb') as f:
+        # mmap refuses empty files; report them the way zipfile would
+        if os.fstat(f.fileno()).st_size == 0:
+            raise zipfile.BadZipFile("File is not a zip file")
+        with _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with zipfile.ZipFile(mm, 'r') as zip_ref:
+                yield zip_ref
+
+
+# Keys that mark a dict as a conversation record
+_CONVERSATION_KEYS = frozenset(('id', 'conversation_id', 'mapping'))
+
+
+def _unwrap_conversations(data):
+    """Return the list of conversations from an export's top-level JSON value"""
+    if not isinstance(data, dict):
+        return data
+    for key in ('conversations', 'data'):
+        if key in data:
+            return data[key]
+    # Otherwise take the first value that looks like a list of conversations
+    for value in data.values():
+        if isinstance(value, list) and value and isinstance(value[0], dict) and not _CONVERSATION_KEYS.isdisjoint(value[0]):
+            return value
+    return data
+
+
+# Where ChatGPT exports put conversations.json, checked before scanning the archive
+_CONVERSATIONS_JSON_PATHS = ('conversations.json', 'chat.openai.com/conversations.json')
+
+
+def _find_conversations_json(zip_ref):
+    """Return the archive name of conversations.json, or None"""
+    for name in _CONVERSATIONS_JSON_PATHS:
+        try:
+            return zip_ref.getinfo(name).filename
+        except KeyError:
+            pass
+    # Unusual layout: scan zipfile's own entry list (namelist() would copy it)
+    return next((info.filename for info in zip_ref.filelist if info.filename.endswith('conversations.json')), None)
+
+
+def _fail_job(job_id, error):
+    """Mark a job as failed, keeping its owner fields so /upload-status can report the error"""
+    with job_lock:
+        job = processing_jobs.get(job_id)
+        if job is not None:
+            job.update({"status": "error", "error": error})
+
+
+def reassemble_and_process_file(job_id, chunks_dir, filename, chunk_files, session_id):
+    """Reassemble chunks into one upload file, then process it as a background job"""
+    reassembled_path = os.path.join(STORAGE_DIR, 'uploads', f'{session_id}_{job_id}_{filename}')
     try:
-        # Get all chunk files and sort by index
-        chunk_files = sorted(
-            [f for f in os.listdir(chunks_dir) if f.startswith('chunk_')],
-            key=lambda x: int(x.split('_')[1])
-        )
+        chunk_files = sorted(chunk_files, key=lambda x: int(x.split('_')[1]))
+        os.makedirs(os.path.dirname(reassembled_path), exist_ok=True)
         
-        # Reassemble file
-        reassembled_path = os.path.join(STORAGE_DIR, f'reassembled_{file_id}_{filename}')
+        # One copy buffer shared by every chunk (only used without sendfile)
+        buf = bytearray(COPY_BUFFER_SIZE)
         with open(reassembled_path, 'wb') as outfile:
             for chunk_file in chunk_files:
                 chunk_path = os.path.join(chunks_dir, chunk_file)
-                with open(chunk_path, 'rb') as infile:
-                    outfile.write(infile.read())
+                _append_file(outfile, chunk_path, buf)
                 # Clean up chunk
                 os.remove(chunk_path)
         
@@ -4173,134 +3407,26 @@ def reassemble_and_process_file(chunks_dir, file_id, filename):
         except:
             pass
         
-        # Process the reassembled file
-        return process_uploaded_file(reassembled_path, filename)
-    
-    except Exception as e:
-        logger.exception("Error reassembling file")
-        return jsonify({"error": f"Error reassembling file: {str(e)}"}), 500
-
-
-def process_uploaded_file(file_path, filename):
-    """Process uploaded file (ZIP or JSON)"""
-    global parser
-    
-    try:
-        filename_lower = filename.lower()
-        
-        if filename_lower.endswith('.zip'):
-            # Handle ZIP file
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                conversations_json = None
-                for name in zip_ref.namelist():
-                    if name.endswith('conversations.json'):
-                        conversations_json = name
-                        break
-                
-                if not conversations_json:
-                    os.remove(file_path)
-                    return jsonify({"error": "No conversations.json found in ZIP file"}), 400
-                
-                with zip_ref.open(conversations_json) as f:
-                    data = json.load(f)
-        
-        elif filename_lower.endswith('.json'):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        else:
-            os.remove(file_path)
-            return jsonify({"error": "Unsupported file type"}), 400
-        
-        # Clean up reassembled file
-        os.remove(file_path)
-        
-        # Process data (same as regular upload)
-        return process_conversation_data(data)
+        with job_lock:
+            if job_id in processing_jobs:
+                processing_jobs[job_id]["input_file"] = reassembled_path
     
     except Exception as e:
-        logger.exception("Error processing uploaded file")
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        return jsonify({"error": f"Error processing file: {str(e)}"}), 500
-
-
-def process_conversation_data(data):
-    """Process conversation data and store it"""
-    global parser
-    
-    # Validate and normalize data structure
-    if isinstance(data, dict):
-        if "conversations" in data:
-            data = data["conversations"]
-        elif "data" in data:
-            data = data["data"]
-        else:
-            for key, value in data.items():
-                if isinstance(value, list) and len(value) > 0:
-                    if isinstance(value[0], dict) and ("id" in value[0] or "conversation_id" in value[0] or "mapping" in value[0]):
-                        data = value
-                        break
-    
-    if not isinstance(data, list):
-        return jsonify({"error": f"Invalid data format. Expected a list of conversations."}), 400
-    
-    if len(data) == 0:
-        return jsonify({"error": "No conversations found in the file."}), 400
-    
-    logger.info(f"Parsing {len(data)} conversations from upload")
-    logger.info(f"Data type: {type(data)}, First item type: {type(data[0]) if data else 'empty'}")
-    
-    # Parse the data
-    parser = ChatGPTParser()
-    try:
-        parser.parse_from_json(data)
-        logger.info(f"Parsed {len(parser.conversations)} conversations successfully")
-        
-        # Check if parsing actually found conversations
-        if len(parser.conversations) == 0:
-            logger.warning("Parser completed but found 0 conversations with messages")
-            return jsonify({
-                "error": "No conversations with messages found in the file.",
-                "details": f"Parsed {len(data)} entries but none contained messages"
-            }), 400
-    except Exception as parse_error:
-        logger.exception(f"Error parsing conversations in process_conversation_data: {parse_error}")
-        return jsonify({
-            "error": f"Error parsing conversations: {str(parse_error)}",
-            "details": f"Exception type: {type(parse_error).__name__}"
-        }), 500
-    
-    # Store data in file with session prefix and expiration
-    session_id = session.get('_id', secrets.token_hex(16))
-    file_id = hashlib.md5(f"{session_id}_{time.time()}".encode()).hexdigest()
-    storage_file = os.path.join(STORAGE_DIR, f'{session_id}_conv_{file_id}.json')  # Add session prefix
-    expires_at = time.time() + EPHEMERAL_TTL
-    
-    data_json = json.dumps(data)
-    with open(storage_file, 'w', encoding='utf-8') as f:
-        f.write(data_json)
-    
-    session['conversations_file'] = storage_file
-    session['conversations_expires_at'] = expires_at  # Add expiration to session
-    session.permanent = True
-    
-    cleanup_old_files()  # Trigger cleanup
+        logger.exception(f"[Job {job_id}] Error reassembling file")
+        _fail_job(job_id, f"Error reassembling file: {str(e)}")
+        shutil.rmtree(chunks_dir, ignore_errors=True)
+        if os.path.exists(reassembled_path):
+            try:
+                os.remove(reassembled_path)
+            except:
+                pass
+        return
     
-    stats = parser.get_stats()
-    logger.info(f"Upload complete: {stats['total_conversations']} conversations loaded")
-    return jsonify({
-        "success": True,
-        "stats": stats,
-        "expires_at": expires_at,  # Add expiration to response
-        "expires_in": int(EPHEMERAL_TTL),
-        "message": f"Successfully loaded {stats['total_conversations']} conversations"
-    })
+    process_file_background(job_id, reassembled_path, filename, session_id)
 
 
 def process_file_background(job_id, file_path, filename, session_id):
     """Process file in background thread with expiration checks"""
-    global parser, processing_jobs
-    
     try:
         # Check if job expired before processing
         with job_lock:
@@ -4339,96 +3465,106 @@ def process_file_background(job_id, file_path, filename, session_id):
             processing_jobs[job_id]["progress"] = 10
             processing_jobs[job_id]["message"] = "Reading file..."
         
+        # json_path is the export as a plain JSON file; a bare list is later
+        # renamed into storage as-is
+        json_path = file_path
         filename_lower = filename.lower()
         if filename_lower.endswith('.zip'):
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                conversations_json = None
-                for name in zip_ref.namelist():
-                    if name.endswith('conversations.json'):
-                        conversations_json = name
-                        break
+            with _open_zip(file_path) as zip_ref:
+                conversations_json = _find_conversations_json(zip_ref)
                 
                 if not conversations_json:
-                    with job_lock:
-                        processing_jobs[job_id] = {
-                            "status": "error",
-                            "error": "No conversations.json found in ZIP file"
-                        }
+                    _fail_job(job_id, "No conversations.json found in ZIP file")
                     os.remove(file_path)
                     return
                 
-                with zip_ref.open(conversations_json) as f:
-                    data = json.load(f)
-        elif filename_lower.endswith('.json'):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        else:
-            with job_lock:
-                processing_jobs[job_id] = {
-                    "status": "error",
-                    "error": "Unsupported file type"
-                }
+                json_path = f'{file_path}.conversations.json'
+                with zip_ref.open(conversations_json) as src, open(json_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+            os.remove(file_path)
+        elif not filename_lower.endswith('.json'):
+            _fail_job(job_id, "Unsupported file type")
             os.remove(file_path)
             return
         
-        # Clean up uploaded file
-        os.remove(file_path)
-        
-        # Normalize data structure
-        with job_lock:
-            processing_jobs[job_id]["progress"] = 30
-            processing_jobs[job_id]["message"] = "Processing data structure..."
-        
-        if isinstance(data, dict):
-            if "conversations" in data:
-                data = data["conversations"]
-            elif "data" in data:
-                data = data["data"]
+        error = None
+        with open(json_path, 'rb') as f:
+            # A bare list is stored byte-for-byte; anything unwrapped is re-encoded
+            store_as_is = _json_starts_with_list(f)
+            data = None
+            if store_as_is and ijson is not None:
+                # Decode and parse one conversation at a time so the full list
+                # never sits in memory next to the parser
+                with job_lock:
+                    processing_jobs[job_id]["progress"] = 50
+                    processing_jobs[job_id]["message"] = "Parsing conversations..."
+                parser = ChatGPTParser()
+                try:
+                    parser.parse_from_stream(f)
+                except ijson.JSONError:
+                    error = "Invalid JSON file"
+                except ValueError as e:
+                    # An empty list comes back from the parser as "Data list is empty"
+                    if parser.conversations or str(e) != "Data list is empty":
+                        raise
+                    error = "No conversations found in file"
             else:
-                for key, value in data.items():
-                    if isinstance(value, list) and len(value) > 0:
-                        if isinstance(value[0], dict) and ("id" in value[0] or "conversation_id" in value[0] or "mapping" in value[0]):
-                            data = value
-                            break
+                try:
+                    data = _json_loads(f.read())
+                except ValueError:
+                    error = "Invalid JSON file"
         
-        if not isinstance(data, list) or len(data) == 0:
-            with job_lock:
-                processing_jobs[job_id] = {
-                    "status": "error",
-                    "error": "No conversations found in file"
-                }
+        if error:
+            _fail_job(job_id, error)
+            os.remove(json_path)
             return
         
-        # Parse conversations
-        with job_lock:
-            processing_jobs[job_id]["progress"] = 50
-            processing_jobs[job_id]["message"] = f"Parsing {len(data)} conversations..."
-        
-        parser = ChatGPTParser()
-        parser.parse_from_json(data)
-        
-        if len(parser.conversations) == 0:
+        if data is not None:
+            # Normalize data structure
             with job_lock:
-                processing_jobs[job_id] = {
-                    "status": "error",
-                    "error": "No conversations with messages found"
-                }
-            return
+                processing_jobs[job_id]["progress"] = 30
+                processing_jobs[job_id]["message"] = "Processing data structure..."
+            
+            if not store_as_is:
+                data = _unwrap_conversations(data)
+            
+            if not isinstance(data, list) or len(data) == 0:
+                _fail_job(job_id, "No conversations found in file")
+                os.remove(json_path)
+                return
+            
+            # Parse conversations
+            with job_lock:
+                processing_jobs[job_id]["progress"] = 50
+                processing_jobs[job_id]["message"] = f"Parsing {len(data)} conversations..."
+            
+            parser = ChatGPTParser()
+            parser.parse_from_json(data)
+            
+            if len(parser.conversations) == 0:
+                _fail_job(job_id, "No conversations with messages found")
+                os.remove(json_path)
+                return
         
         # Store data with session prefix and expiration
         with job_lock:
             if job_id not in processing_jobs:
                 # Job was deleted/expired during processing
                 logger.warning(f"Job {job_id} was removed during processing")
+                os.remove(json_path)
                 return
             processing_jobs[job_id]["progress"] = 80
             processing_jobs[job_id]["message"] = "Processing data..."
         
-        file_id = hashlib.md5(f"{session_id}_{time.time()}".encode()).hexdigest()
+        file_id = secrets.token_hex(16)
         storage_file = os.path.join(STORAGE_DIR, f'{session_id}_conv_{file_id}.json')  # Add session prefix
         
-        with open(storage_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f)
+        if store_as_is:
+            os.replace(json_path, storage_file)
+        else:
+            with open(storage_file, 'wb') as f:
+                f.write(_json_dumps(data))
+            os.remove(json_path)
         
         stats = parser.get_stats()
         expires_at = time.time() + EPHEMERAL_TTL
@@ -4441,23 +3577,21 @@ def process_file_background(job_id, file_path, filename, session_id):
                     "message": f"Successfully loaded {stats['total_conversations']} conversations",
                     "storage_file": storage_file,
                     "stats": stats,
-                    "expires_at": expires_at  # Update expiration
+                    "expires_at": expires_at,  # Update expiration
+                    "completed_at": time.time()
                 })
         
         logger.info(f"[Job {job_id}] Processing complete: {stats['total_conversations']} conversations")
         
     except Exception as e:
         logger.exception(f"[Job {job_id}] Error in background processing: {e}")
-        with job_lock:
-            processing_jobs[job_id] = {
-                "status": "error",
-                "error": str(e)
-            }
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
+        _fail_job(job_id, str(e))
+        for path in (file_path, f'{file_path}.conversations.json'):
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except:
+                    pass
 
 
 @app.route('/upload', methods=['POST'])
@@ -4514,13 +3648,8 @@ def upload():
                 "expires_at": expires_at  # Add expiration
             }
         
-        # Start background processing thread
-        thread = threading.Thread(
-            target=process_file_background,
-            args=(job_id, file_path, file.filename, session_id),
-            daemon=True
-        )
-        thread.start()
+        # Hand off to a background worker
+        job_executor.submit(process_file_background, job_id, file_path, file.filename, session_id)
         
         # Return immediately with job ID and expiration
         return jsonify({
@@ -4536,6 +3665,10 @@ def upload():
         return jsonify({"error": f"Error uploading file: {str(e)}"}), 500
 
 
+# Job fields returned by /upload-status
+_JOB_STATUS_FIELDS = ('status', 'progress', 'message', 'error', 'stats', 'expires_at')
+
+
 @app.route('/upload-status/<job_id>')
 @login_required
 def upload_status(job_id):
@@ -4543,6 +3676,7 @@ def upload_status(job_id):
     session_id = session.get('_id')
     user_id = session.get('user_id')
     
+    drop_completed_jobs()
     with job_lock:
         job = processing_jobs.get(job_id)
     
@@ -4564,7 +3698,7 @@ def upload_status(job_id):
             "status": "expired"
         }), 410  # 410 Gone
     
-    # If completed, update session and clean up job
+    # If completed, update session (drop_completed_jobs() forgets the job later)
     if job.get("status") == "completed":
         storage_file = job.get("storage_file")
         if storage_file and os.path.exists(storage_file):
@@ -4573,17 +3707,12 @@ def upload_status(job_id):
             session.permanent = True
             session.modified = True
             logger.info(f"Job {job_id} completed, session updated with file: {storage_file}")
-        
-        # Clean up job after returning (keep for a bit in case of retries)
-        def cleanup_job():
-            time.sleep(60)  # Keep for 1 minute
             with job_lock:
-                if job_id in processing_jobs:
-                    del processing_jobs[job_id]
-        threading.Thread(target=cleanup_job, daemon=True).start()
+                job.setdefault("delivered_at", time.time())
     
-    # Return job status with expiration info
-    response = dict(job)
+    # Return job status with expiration info (internal fields such as paths and
+    # user ids stay server-side)
+    response = {key: job[key] for key in _JOB_STATUS_FIELDS if key in job}
     response['expires_in'] = max(0, int(expires_at - time.time())) if expires_at > 0 else 0
     return jsonify(response)
 
@@ -4592,11 +3721,10 @@ def upload_status(job_id):
 @login_required
 def clear_data():
     """Clear the current loaded data"""
-    global parser
-    parser = None
-    
     # Clear from file storage
     storage_file = session.get('conversations_file', None)
+    if storage_file:
+        _evict_parser(storage_file)
     if storage_file and os.path.exists(storage_file):
         try:
             os.remove(storage_file)
@@ -4615,33 +3743,31 @@ def clear_data():
 @app.route('/conversation/<conv_id>')
 @login_required
 def get_conversation(conv_id):
-    global parser
     parser = get_parser_from_session()
     if not parser:
         return jsonify({"error": "No data loaded"}), 400
     
-    for conv in parser.conversations:
-        if conv.id == conv_id:
-            return jsonify({
-                "id": conv.id,
-                "title": conv.title,
-                "project_name": conv.project_name,
-                "create_time": conv.create_time.strftime('%B %d, %Y') if conv.create_time else None,
-                "model": conv.model,
-                "markdown": conv.to_markdown(),
-                "messages": [
-                    {"role": m.role, "content": m.content}
-                    for m in conv.messages
-                ]
-            })
+    conv = parser.get_conversation(conv_id)
+    if not conv:
+        return jsonify({"error": "Conversation not found"}), 404
     
-    return jsonify({"error": "Conversation not found"}), 404
+    return jsonify({
+        "id": conv.id,
+        "title": conv.title,
+        "project_name": conv.project_name,
+        "create_time": conv.create_time.strftime('%B %d, %Y') if conv.create_time else None,
+        "model": conv.model,
+        "markdown": conv.to_markdown(),
+        "messages": [
+            {"role": m.role, "content": m.content}
+            for m in conv.messages
+        ]
+    })
 
 
 @app.route('/search')
 @login_required
 def search():
-    global parser
     parser = get_parser_from_session()
     query = request.args.get('q', '')
     if not parser:
@@ -4665,7 +3791,6 @@ def search():
 @login_required
 def debug_info():
     """Debug endpoint to see data structure"""
-    global parser
     parser = get_parser_from_session()
     if not parser:
         return jsonify({"error": "No data loaded"}), 400
@@ -4675,8 +3800,8 @@ def debug_info():
     raw_data = []
     if storage_file and os.path.exists(storage_file):
         try:
-            with open(storage_file, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            with open(storage_file, 'rb') as f:
+                raw_data = _json_loads(f.read())
         except Exception as e:
             logger.error(f"Error loading raw data from file: {e}")
     
@@ -4707,43 +3832,128 @@ def debug_info():
 @app.route('/export-all')
 @login_required
 def export_all():
-    global parser
     parser = get_parser_from_session()
     if not parser:
         return "No data loaded", 400
     
     logger.info(f"Exporting {len(parser.conversations)} conversations")
     
-    # Create a ZIP file in memory
-    memory_file = BytesIO()
-    with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        # Export by project
-        for project_id, project in parser.projects.items():
-            for conv in project.conversations:
-                filename = f"{_sanitize_filename(project.name)}/{_sanitize_filename(conv.title)}.md"
-                zf.writestr(filename, conv.to_markdown())
-        
-        # Export unassigned
-        for conv in parser.unassigned_conversations:
-            filename = f"_Unassigned/{_sanitize_filename(conv.title)}.md"
-            zf.writestr(filename, conv.to_markdown())
-    
-    memory_file.seek(0)
-    return send_file(
-        memory_file,
+    # Stream the ZIP entry by entry instead of building it in memory
+    return app.response_class(
+        _stream_zip(_export_markdown_files(parser)),
         mimetype='application/zip',
-        as_attachment=True,
-        download_name='chatgpt_export_markdown.zip'
+        headers={'Content-Disposition': 'attachment; filename=chatgpt_export_markdown.zip'}
     )
 
 
-def _sanitize_filename(name: str) -> str:
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '_')
-    if len(name) > 80:
-        name = name[:80]
-    return name.strip() or "untitled"
+class _ZipChunkSink:
+    """Write-only file object that collects zipfile output until drained.
+
+    It has no tell()/seek(), so zipfile writes in streaming mode.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _stream_zip(files):
+    """Yield a deflated ZIP of (path, text) pairs as each entry is written"""
+    sink = _ZipChunkSink()
+    # Level 1 deflate: several times faster than the default 6, and markdown
+    # still compresses well
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for filename, text in files:
+            zf.writestr(filename, text)
+            yield sink.drain()
+    # Central directory, written on close
+    yield sink.drain()
+
+
+# Markdown is rendered in worker processes only for big exports on machines with
+# enough cores; below that, pickling conversations over costs more than it saves
+EXPORT_PARALLEL_MIN_CONVERSATIONS = 2000
+EXPORT_PARALLEL_MIN_CPUS = 4
+# One pool per server process, started on first use and shared by all exports
+EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS', min(os.cpu_count() or 1, 4)))
+EXPORT_BATCH_SIZE = 64
+_export_pool = None
+_export_pool_lock = threading.Lock()
+
+
+def _get_export_pool():
+    """Return the process pool for rendering exports, creating it on first use"""
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is None:
+            # spawn, not fork: forking a threaded server process is unsafe
+            _export_pool = ProcessPoolExecutor(max_workers=EXPORT_WORKERS,
+                                               mp_context=multiprocessing.get_context('spawn'))
+        return _export_pool
+
+
+def _discard_export_pool(pool):
+    """Forget a broken pool so the next export starts a fresh one"""
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is pool:
+            _export_pool = None
+    pool.shutdown(wait=False)
+
+
+def _export_markdown_files(parser):
+    """Yield (zip path, markdown) for every conversation, grouped by project"""
+    filenames = []
+    conversations = []
+    # Export by project
+    for project in parser.projects.values():
+        folder = _sanitize_filename(project.name, 80)
+        for conv in project.conversations:
+            filenames.append(f"{folder}/{_sanitize_filename(conv.title, 80)}.md")
+            conversations.append(conv)
+    # Export unassigned
+    for conv in parser.unassigned_conversations:
+        filenames.append(f"_Unassigned/{_sanitize_filename(conv.title, 80)}.md")
+        conversations.append(conv)
+    
+    cpus = os.cpu_count() or 1
+    if len(conversations) < EXPORT_PARALLEL_MIN_CONVERSATIONS or cpus < EXPORT_PARALLEL_MIN_CPUS:
+        yield from zip(filenames, map(Conversation.to_markdown, conversations))
+        return
+    
+    # Keep only a small window of batches in flight, so rendered markdown never
+    # runs far ahead of how fast the client reads the ZIP
+    pool = _get_export_pool()
+    max_in_flight = 2 * EXPORT_WORKERS
+    names = iter(filenames)
+    pending = deque()
+    try:
+        for start in range(0, len(conversations), EXPORT_BATCH_SIZE):
+            pending.append(pool.submit(_render_markdown_batch, conversations[start:start + EXPORT_BATCH_SIZE]))
+            if len(pending) >= max_in_flight:
+                for text in pending.popleft().result():
+                    yield next(names), text
+        while pending:
+            for text in pending.popleft().result():
+                yield next(names), text
+    except BrokenProcessPool:
+        _discard_export_pool(pool)
+        raise
+    finally:
+        # A closed stream (client disconnect) leaves queued batches behind
+        for future in pending:
+            future.cancel()
 
 
 def load_export(export_path: str):
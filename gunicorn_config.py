@@ -15,9 +15,12 @@ backlog = 2048
 # Worker processes - limit to 2 workers to avoid memory issues
 cpu_count = multiprocessing.cpu_count()
 workers = min(2, cpu_count)  # Max 2 workers to avoid memory issues
-worker_class = 'sync'
+# Threaded workers so one slow upload doesn't block every other request
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
 worker_connections = 1000
 timeout = 300  # 5 minutes for large file processing
+graceful_timeout = 30
 keepalive = 5
 
 # Increase limits for large file uploads
@@ -3,15 +3,90 @@ ChatGPT Export Parser
 Parses the conversations.json from ChatGPT data export
 """
 
+import hashlib
 import json
+import mmap
 import os
+import sys
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dateutil import parser as date_parser
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 
+# Optional: lets parse_from_stream decode one conversation at a time
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-@dataclass
+# Optional: faster JSON decoding (accepts bytes directly)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode data as UTF-8 JSON bytes, using orjson when available"""
+    return orjson.dumps(data) if orjson else json.dumps(data).encode('utf-8')
+
+
+def _load_json_file(f) -> Any:
+    """Decode JSON from a binary file object positioned at its start.
+    
+    With orjson, a regular file is memory-mapped and decoded in place rather
+    than first being copied into one large bytes object.
+    """
+    if orjson is not None:
+        try:
+            fd = f.fileno()
+            size = os.fstat(fd).st_size if f.tell() == 0 else 0
+        except (AttributeError, OSError):
+            size = 0
+        if size:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    return _json_loads(f.read())
+
+
+def _json_starts_with_list(f) -> bool:
+    """Peek at a JSON file's first significant byte: True for a top-level array"""
+    while True:
+        block = f.read(256)
+        head = block.lstrip(b' \t\r\n')
+        if head or not block:
+            break
+    f.seek(0)
+    return head[:1] == b'['
+
+
+# Characters not allowed in exported filenames, all mapped to "_"
+_FILENAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+_fromtimestamp = datetime.fromtimestamp
+
+# Message header pieces used by Message.markdown_header
+_ROLE_EMOJI = {"user": "👤", "assistant": "🤖", "system": "⚙️", "tool": "🔧"}
+_DATE_FMT = '%b %d, %Y %I:%M %p'
+
+
+def _to_datetime(ts: Any) -> Optional[datetime]:
+    """Convert an export timestamp to a datetime, or None if it is missing or invalid"""
+    if not ts:
+        return None
+    try:
+        return _fromtimestamp(ts)
+    except (ValueError, TypeError, OSError, OverflowError):
+        return None
+
+
+@dataclass(**_DATACLASS_OPTS)
 class Message:
     """Represents a single message in a conversation"""
     id: str
@@ -19,17 +94,23 @@ class Message:
     content: str
     timestamp: Optional[datetime] = None
     model: Optional[str] = None
+    word_count: int = field(init=False, default=0)
     
-    def to_markdown(self) -> str:
-        role_emoji = {"user": "👤", "assistant": "🤖", "system": "⚙️", "tool": "🔧"}
-        emoji = role_emoji.get(self.role, "💬")
-        header = f"### {emoji} {self.role.title()}"
+    def __post_init__(self):
+        # Counted once here so stats never re-split message text
+        self.word_count = len(self.content.split())
+    
+    def markdown_header(self) -> str:
+        header = f"### {_ROLE_EMOJI.get(self.role, '💬')} {self.role.title()}"
         if self.timestamp:
-            header += f" – {self.timestamp.strftime('%b %d, %Y %I:%M %p')}"
-        return f"{header}\n\n{self.content}\n"
+            return f"{header} – {self.timestamp.strftime(_DATE_FMT)}"
+        return header
+    
+    def to_markdown(self) -> str:
+        return f"{self.markdown_header()}\n\n{self.content}\n"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Conversation:
     """Represents a ChatGPT conversation"""
     id: str
@@ -42,23 +123,25 @@ class Conversation:
     model: Optional[str] = None
     
     def to_markdown(self) -> str:
-        lines = [f"# {self.title}\n"]
+        # One flat list of parts and a single join; each part carries its own
+        # leading separator so message bodies are never copied twice
+        parts = [f"# {self.title}\n"]
         
         if self.project_name:
-            lines.append(f"**Project:** {self.project_name}\n")
+            parts.append(f"\n**Project:** {self.project_name}\n")
         if self.create_time:
-            lines.append(f"**Created:** {self.create_time.strftime('%B %d, %Y')}\n")
+            parts.append(f"\n**Created:** {self.create_time.strftime('%B %d, %Y')}\n")
         if self.update_time:
-            lines.append(f"**Last Updated:** {self.update_time.strftime('%B %d, %Y')}\n")
+            parts.append(f"\n**Last Updated:** {self.update_time.strftime('%B %d, %Y')}\n")
         if self.model:
-            lines.append(f"**Model:** {self.model}\n")
+            parts.append(f"\n**Model:** {self.model}\n")
         
-        lines.append("\n---\n")
+        parts.append("\n\n---\n")
         
         for msg in self.messages:
-            lines.append(msg.to_markdown())
+            parts.extend(("\n", msg.markdown_header(), "\n\n", msg.content, "\n"))
         
-        return "\n".join(lines)
+        return "".join(parts)
     
     def get_preview(self, max_length: int = 200) -> str:
         """Get a preview of the conversation content"""
@@ -71,25 +154,38 @@ class Conversation:
         return "No preview available"
     
     def word_count(self) -> int:
-        return sum(len(msg.content.split()) for msg in self.messages)
+        return sum(msg.word_count for msg in self.messages)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Project:
     """Represents a ChatGPT project (folder)"""
     id: str
     name: str
     conversations: List[Conversation] = field(default_factory=list)
+    _message_count: int = field(init=False, default=0, repr=False)
+    _word_count: int = field(init=False, default=0, repr=False)
+    
+    def __post_init__(self):
+        conversations, self.conversations = self.conversations, []
+        for conv in conversations:
+            self.add_conversation(conv)
+    
+    def add_conversation(self, conv: Conversation) -> None:
+        """Append a conversation, keeping the project totals up to date"""
+        self.conversations.append(conv)
+        self._message_count += len(conv.messages)
+        self._word_count += conv.word_count()
     
     @property
     def message_count(self) -> int:
         """Total messages across all conversations in this project"""
-        return sum(len(c.messages) for c in self.conversations)
+        return self._message_count
     
     @property
     def word_count(self) -> int:
         """Total words across all conversations in this project"""
-        return sum(c.word_count() for c in self.conversations)
+        return self._word_count
 
 
 class ChatGPTParser:
@@ -100,6 +196,9 @@ class ChatGPTParser:
         self.conversations: List[Conversation] = []
         self.projects: Dict[str, Project] = {}
         self.unassigned_conversations: List[Conversation] = []
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._by_id: Optional[Dict[str, Conversation]] = None
+        self._search_blobs: Optional[List[str]] = None
         
     def parse(self) -> None:
         """Parse the ChatGPT export from file path"""
@@ -111,8 +210,13 @@ class ChatGPTParser:
         if not os.path.exists(conversations_file):
             raise FileNotFoundError(f"conversations.json not found in {self.export_path}")
         
-        with open(conversations_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(conversations_file, 'rb') as f:
+            if ijson is not None and _json_starts_with_list(f):
+                # Decode one conversation at a time instead of the whole export
+                # (anything other than a top-level array takes the full load below)
+                self._parse_data(ijson.items(f, 'item', use_float=True))
+                return
+            data = _load_json_file(f)
         
         self._parse_data(data)
     
@@ -124,15 +228,33 @@ class ChatGPTParser:
             raise ValueError("Data list is empty")
         self._parse_data(data)
     
-    def _parse_data(self, data: List[Dict[str, Any]]) -> None:
-        """Internal method to parse conversation data"""
+    def parse_from_stream(self, f) -> None:
+        """Parse a JSON list of conversations from a binary file object.
+        
+        With ijson installed, conversations are decoded one at a time instead of
+        materialising the whole list first; otherwise this falls back to json.load.
+        """
+        if ijson is None:
+            self.parse_from_json(_load_json_file(f))
+            return
+        self._parse_data(ijson.items(f, 'item', use_float=True))
+        if not self.conversations:
+            raise ValueError("Data list is empty")
+    
+    def _parse_data(self, data: Iterable[Dict[str, Any]]) -> None:
+        """Internal method to parse conversation data (a list or any iterable)"""
         import logging
         logger = logging.getLogger(__name__)
         
-        logger.info(f"Starting to parse {len(data)} conversation entries")
+        if hasattr(data, '__len__'):
+            logger.info(f"Starting to parse {len(data)} conversation entries")
+        else:
+            logger.info("Starting to parse streamed conversation entries")
         
         parse_errors = []
+        entry_count = 0
         for idx, conv_data in enumerate(data):
+            entry_count += 1
             try:
                 if not isinstance(conv_data, dict):
                     logger.warning(f"Conversation {idx} is not a dict (got {type(conv_data).__name__}), skipping")
@@ -145,15 +267,13 @@ class ChatGPTParser:
                 if len(conversation.messages) > 0:
                     self.conversations.append(conversation)
                     
+                    # Grouped into projects after sorting, below
                     if conversation.project_id and conversation.project_name:
                         if conversation.project_id not in self.projects:
                             self.projects[conversation.project_id] = Project(
                                 id=conversation.project_id,
                                 name=conversation.project_name
                             )
-                        self.projects[conversation.project_id].conversations.append(conversation)
-                    else:
-                        self.unassigned_conversations.append(conversation)
                 else:
                     logger.warning(f"Conversation {idx} ({conversation.id}) has no messages, skipping")
             except Exception as e:
@@ -164,28 +284,53 @@ class ChatGPTParser:
         if parse_errors:
             logger.warning(f"Encountered {len(parse_errors)} parsing errors (first 5): {parse_errors[:5]}")
         
-        if len(self.conversations) == 0 and len(data) > 0:
-            error_summary = f"Failed to parse any conversations from {len(data)} entries"
+        if len(self.conversations) == 0 and entry_count > 0:
+            error_summary = f"Failed to parse any conversations from {entry_count} entries"
             if parse_errors:
                 error_summary += f". Sample errors: {', '.join(parse_errors[:3])}"
             raise ValueError(error_summary)
         
         logger.info(f"Successfully parsed {len(self.conversations)} conversations with messages")
+        self._stats_cache = None
+        self._by_id = None
+        self._search_blobs = None
         
-        # Sort conversations by date
+        # Sort conversations by date once, then split the sorted list into
+        # projects and unassigned. The sort is stable, so each group ends up
+        # in the same order as sorting it on its own would give.
         self.conversations.sort(key=lambda c: c.update_time or datetime.min, reverse=True)
-        self.unassigned_conversations.sort(key=lambda c: c.update_time or datetime.min, reverse=True)
-        for project in self.projects.values():
-            project.conversations.sort(key=lambda c: c.update_time or datetime.min, reverse=True)
+        self.unassigned_conversations.clear()
+        for project_id, project in self.projects.items():
+            self.projects[project_id] = Project(id=project.id, name=project.name)
+        for conversation in self.conversations:
+            if conversation.project_id and conversation.project_name:
+                self.projects[conversation.project_id].add_conversation(conversation)
+            else:
+                self.unassigned_conversations.append(conversation)
     
     def _parse_conversation(self, data: Dict[str, Any]) -> Conversation:
         """Parse a single conversation from the export data"""
         # Try multiple possible keys for conversation ID
-        conv_id = (data.get("id") or 
-                  data.get("conversation_id") or 
-                  data.get("uuid") or
-                  (data.get("mapping", {}).get(list(data.get("mapping", {}).keys())[0], {}).get("message", {}).get("id") if data.get("mapping") else None) or
-                  f"conv_{hash(str(data))}")
+        conv_id = data.get("id") or data.get("conversation_id") or data.get("uuid")
+        mapping = data.get("mapping")
+        if not conv_id and mapping:
+            # Fall back to the first mapping node's message ID
+            first_node = next(iter(mapping.values()))
+            conv_id = (first_node.get("message") or {}).get("id")
+        if not conv_id:
+            # Stable across runs (unlike hash()); fed incrementally so the
+            # conversation is never stringified as a whole
+            digest = hashlib.blake2b(digest_size=8)
+            digest.update(f"{data.get('title')}|{data.get('create_time')}|{data.get('update_time')}".encode('utf-8'))
+            if isinstance(mapping, dict):
+                for node_id in mapping:
+                    digest.update(f"|{node_id}".encode('utf-8'))
+            # Mapping-less exports: the messages themselves tell conversations apart
+            messages = data.get("messages")
+            if isinstance(messages, list):
+                for msg in messages:
+                    digest.update(f"|{msg}".encode('utf-8'))
+            conv_id = f"conv_{digest.hexdigest()}"
         
         # Ensure we have a string ID
         if not isinstance(conv_id, str):
@@ -194,18 +339,8 @@ class ChatGPTParser:
         title = data.get("title", "Untitled Conversation")
         
         # Parse timestamps
-        create_time = None
-        update_time = None
-        if data.get("create_time"):
-            try:
-                create_time = datetime.fromtimestamp(data["create_time"])
-            except (ValueError, TypeError, OSError):
-                pass
-        if data.get("update_time"):
-            try:
-                update_time = datetime.fromtimestamp(data["update_time"])
-            except (ValueError, TypeError, OSError):
-                pass
+        create_time = _to_datetime(data.get("create_time"))
+        update_time = _to_datetime(data.get("update_time"))
         
         # Parse project info (ChatGPT calls them "gizmo" or folder)
         project_id = None
@@ -288,6 +423,9 @@ class ChatGPTParser:
                 role = author
             else:
                 role = author.get("role", "unknown")
+            # Only a handful of distinct roles, so share one string object each
+            if isinstance(role, str):
+                role = sys.intern(role)
             
             # Skip system/tool messages if they're empty or metadata
             if role in ("system", "tool"):
@@ -329,12 +467,7 @@ class ChatGPTParser:
                 continue
             
             # Parse timestamp
-            timestamp = None
-            if msg_data.get("create_time"):
-                try:
-                    timestamp = datetime.fromtimestamp(msg_data["create_time"])
-                except (ValueError, TypeError, OSError):
-                    pass
+            timestamp = _to_datetime(msg_data.get("create_time"))
             
             # Get model info
             model = msg_data.get("metadata", {}).get("model_slug")
@@ -349,32 +482,49 @@ class ChatGPTParser:
         
         return messages
     
+    def get_conversation(self, conv_id: str) -> Optional[Conversation]:
+        """Look up a conversation by ID (index built on first use)"""
+        if self._by_id is None:
+            # Reversed so the first conversation wins if an ID repeats
+            self._by_id = {c.id: c for c in reversed(self.conversations)}
+        return self._by_id.get(conv_id)
+    
     def search(self, query: str, case_sensitive: bool = False) -> List[Conversation]:
         """Search conversations by content or title"""
-        results = []
-        search_query = query if case_sensitive else query.lower()
-        
-        for conv in self.conversations:
-            searchable = conv.title if case_sensitive else conv.title.lower()
-            if search_query in searchable:
-                results.append(conv)
-                continue
-            
-            for msg in conv.messages:
-                msg_content = msg.content if case_sensitive else msg.content.lower()
-                if search_query in msg_content:
-                    results.append(conv)
-                    break
-        
-        return results
+        if not case_sensitive:
+            # One lowercased blob per conversation, built on the first search.
+            # NUL separators keep a match from spanning title/message boundaries.
+            if self._search_blobs is None:
+                self._search_blobs = [
+                    "\0".join([conv.title, *(msg.content for msg in conv.messages)]).lower()
+                    for conv in self.conversations
+                ]
+            search_query = query.lower()
+            return [conv for conv, blob in zip(self.conversations, self._search_blobs) if search_query in blob]
+        
+        return [
+            conv for conv in self.conversations
+            if query in conv.title or any(query in msg.content for msg in conv.messages)
+        ]
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Statistics about the parsed data, computed once per parse"""
+        if self._stats_cache is None:
+            self._stats_cache = self._compute_stats()
+        return self._stats_cache
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the parsed data"""
-        total_messages = sum(len(c.messages) for c in self.conversations)
-        total_words = sum(c.word_count() for c in self.conversations)
-        
+        return self.stats
+    
+    def _compute_stats(self) -> Dict[str, Any]:
+        total_messages = 0
+        total_words = 0
         models_used = {}
         for conv in self.conversations:
+            total_messages += len(conv.messages)
+            total_words += conv.word_count()
             if conv.model:
                 models_used[conv.model] = models_used.get(conv.model, 0) + 1
         
@@ -391,6 +541,12 @@ class ChatGPTParser:
         """Export all conversations to markdown files"""
         os.makedirs(output_dir, exist_ok=True)
         
+        # Group output paths that may name the same file (same path, or equal
+        # after case/Unicode folding as on macOS/Windows). Each group is written
+        # in order by one task, so every file is still written and a true
+        # collision ends last-write-wins, same as a sequential loop.
+        targets: Dict[str, List[Tuple[str, Conversation]]] = {}
+        
         # Export by project
         for project_id, project in self.projects.items():
             project_dir = os.path.join(output_dir, self._sanitize_filename(project.name))
@@ -399,8 +555,7 @@ class ChatGPTParser:
             for conv in project.conversations:
                 filename = self._sanitize_filename(conv.title) + ".md"
                 filepath = os.path.join(project_dir, filename)
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(conv.to_markdown())
+                targets.setdefault(_fold_path(filepath), []).append((filepath, conv))
         
         # Export unassigned conversations
         if self.unassigned_conversations:
@@ -410,19 +565,51 @@ class ChatGPTParser:
             for conv in self.unassigned_conversations:
                 filename = self._sanitize_filename(conv.title) + ".md"
                 filepath = os.path.join(unassigned_dir, filename)
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(conv.to_markdown())
+                targets.setdefault(_fold_path(filepath), []).append((filepath, conv))
+        
+        # Many small files: overlap the open/write syscalls across threads
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # list() so the first failed write is raised here
+            list(pool.map(_write_markdown_group, targets.values()))
     
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize a string for use as a filename"""
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            name = name.replace(char, '_')
-        # Limit length
-        if len(name) > 100:
-            name = name[:100]
-        return name.strip() or "untitled"
+        return _sanitize_filename(name)
+
+
+def _sanitize_filename(name: str, limit: int = 100) -> str:
+    """Sanitize a string for use as a filename (shared with the ZIP export in app.py)"""
+    # Replace invalid characters in one pass and limit length
+    return name.translate(_FILENAME_TABLE)[:limit].strip() or "untitled"
+
+
+def _fold_path(path: str) -> str:
+    """Key under which case-insensitive filesystems treat paths as the same file"""
+    return unicodedata.normalize('NFC', os.path.normcase(path)).lower()
+
+
+def _render_markdown_batch(conversations: List[Conversation]) -> List[str]:
+    """Render a batch of conversations; picklable entry point for export worker processes"""
+    return [conv.to_markdown() for conv in conversations]
+
+
+def _write_markdown_group(group: List[Tuple[str, Conversation]]) -> None:
+    """Write (filepath, conversation) pairs from export_to_markdown, in order"""
+    for filepath, conv in group:
+        _write_markdown(filepath, conv)
+
+
+def _write_markdown(filepath: str, conv: Conversation) -> None:
+    """Write one conversation's markdown to filepath"""
+    # Encode once and write the bytes directly, skipping the text-file wrapper
+    data = memoryview(conv.to_markdown().encode('utf-8'))
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 
 def main():
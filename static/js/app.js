@@ -0,0 +1,1225 @@
+// Conversation browser UI. IS_PRODUCTION is set by an inline script in the
+// page template before this file loads.
+
+// Console logging wrapper - only log in development
+const devLog = IS_PRODUCTION ? () => {} : console.log.bind(console);
+const devError = console.error.bind(console); // Always log errors
+
+let currentConversation = null;
+let currentMarkdown = '';
+
+// Element handles used on hot paths, resolved once at DOMContentLoaded.
+// Entries are null on the landing page, so callers still guard.
+const DOM = {};
+
+function cacheDomHandles() {
+    [
+        'conversationsTitle', 'modalOverlay', 'modalBody', 'modalTitle', 'modalSubtitle',
+        'toast', 'searchInput', 'groupName', 'groupKeywords', 'keywordDropdown',
+        'smartGroupsList', 'suggestedGroups'
+    ].forEach(id => {
+        DOM[id] = document.getElementById(id);
+    });
+}
+
+// File Upload Handling
+function initUpload() {
+    devLog('[UPLOAD] Initializing upload handlers...');
+    const uploadArea = document.getElementById('uploadArea');
+    const fileInput = document.getElementById('fileInput');
+    
+    if (!uploadArea || !fileInput) {
+        console.error('[UPLOAD] Upload area or file input not found!', {
+            uploadArea: !!uploadArea,
+            fileInput: !!fileInput
+        });
+        return;
+    }
+    devLog('[UPLOAD] Upload elements found, attaching event listeners');
+    devLog('[UPLOAD] fileInput element:', fileInput);
+    devLog('[UPLOAD] fileInput type:', fileInput.type);
+    devLog('[UPLOAD] fileInput accept:', fileInput.accept);
+    
+    // File input now covers the entire upload area, so clicks go directly to it
+    // Just need to handle the change event
+    devLog('[UPLOAD] File input configured to cover upload area - clicks will work directly');
+    
+    // Ensure file input covers the entire area and is clickable
+    fileInput.style.position = 'absolute';
+    fileInput.style.top = '0';
+    fileInput.style.left = '0';
+    fileInput.style.width = '100%';
+    fileInput.style.height = '100%';
+    fileInput.style.opacity = '0';
+    fileInput.style.cursor = 'pointer';
+    fileInput.style.zIndex = '10';
+    
+    // Make sure all child elements don't block the file input
+    const childElements = uploadArea.querySelectorAll('*:not(#fileInput)');
+    childElements.forEach(function(child) {
+        child.style.pointerEvents = 'none';
+        child.style.position = 'relative';
+        child.style.zIndex = '1';
+        devLog('[UPLOAD] Configured child element:', child.tagName, child.className || child.id);
+    });
+    
+    // Mark as initialized
+    uploadArea.setAttribute('data-listener-attached', 'true');
+    devLog('[UPLOAD] Upload handlers fully initialized and child elements configured');
+    
+    // Test click programmatically after a short delay
+    setTimeout(function() {
+        devLog('[UPLOAD] Testing fileInput.click() programmatically...');
+        try {
+            // This is just a test - don't actually open the picker
+            devLog('[UPLOAD] fileInput element is accessible:', {
+                exists: !!fileInput,
+                type: fileInput.type,
+                accept: fileInput.accept,
+                hasClick: typeof fileInput.click === 'function'
+            });
+        } catch (err) {
+            console.error('[UPLOAD] Error testing fileInput:', err);
+        }
+    }, 1000);
+    
+    // Click handler on upload area to trigger file input
+    uploadArea.addEventListener('click', function(e) {
+        // Only trigger if not clicking directly on the file input
+        if (e.target !== fileInput) {
+            e.preventDefault();
+            e.stopPropagation();
+            devLog('[UPLOAD] Upload area clicked, triggering file input');
+            fileInput.click();
+        }
+    });
+    
+    // File input change - no authentication required
+    fileInput.addEventListener('change', function() {
+        devLog('[UPLOAD] File input changed');
+        if (this.files && this.files[0]) {
+            devLog('[UPLOAD] File selected:', this.files[0].name);
+            uploadFile(this.files[0]);
+        }
+    });
+    
+    // Drag and drop - no authentication required
+    uploadArea.addEventListener('dragover', function(e) {
+        e.preventDefault();
+        e.stopPropagation();
+        uploadArea.classList.add('dragover');
+    });
+    
+    uploadArea.addEventListener('dragleave', function(e) {
+        e.preventDefault();
+        e.stopPropagation();
+        uploadArea.classList.remove('dragover');
+    });
+    
+    uploadArea.addEventListener('drop', function(e) {
+        devLog('[UPLOAD] File dropped');
+        e.preventDefault();
+        e.stopPropagation();
+        uploadArea.classList.remove('dragover');
+        
+        // No authentication required
+        if (e.dataTransfer.files && e.dataTransfer.files[0]) {
+            devLog('[UPLOAD] Dropped file:', e.dataTransfer.files[0].name);
+            uploadFile(e.dataTransfer.files[0]);
+        }
+    });
+    devLog('[UPLOAD] Upload handlers initialized');
+}
+
+// Initialize upload handlers when DOM is ready
+function initializeUpload() {
+    devLog('[UPLOAD] initializeUpload called, readyState:', document.readyState);
+    if (document.readyState === 'loading') {
+        devLog('[UPLOAD] DOM still loading, waiting for DOMContentLoaded');
+        document.addEventListener('DOMContentLoaded', function() {
+            devLog('[UPLOAD] DOMContentLoaded fired, calling initUpload');
+            initUpload();
+        });
+    } else {
+        // DOM is already loaded, initialize immediately
+        devLog('[UPLOAD] DOM already loaded, calling initUpload immediately');
+        initUpload();
+    }
+}
+
+// Try multiple times to ensure it works
+initializeUpload();
+
+// Also try after delays as fallbacks
+setTimeout(function() {
+    const uploadArea = document.getElementById('uploadArea');
+    const fileInput = document.getElementById('fileInput');
+    devLog('[UPLOAD] Fallback check (500ms): uploadArea=', !!uploadArea, 'fileInput=', !!fileInput);
+    if (uploadArea && fileInput) {
+        if (!uploadArea.hasAttribute('data-listener-attached')) {
+            devLog('[UPLOAD] Fallback: Re-initializing upload handlers');
+            uploadArea.setAttribute('data-listener-attached', 'true');
+            initUpload();
+        } else {
+            devLog('[UPLOAD] Listeners already attached');
+        }
+    }
+}, 500);
+
+setTimeout(function() {
+    const uploadArea = document.getElementById('uploadArea');
+    const fileInput = document.getElementById('fileInput');
+    devLog('[UPLOAD] Final check (2000ms): uploadArea=', !!uploadArea, 'fileInput=', !!fileInput);
+    if (uploadArea && fileInput) {
+        // Test if click works
+        devLog('[UPLOAD] Testing click handler...');
+        uploadArea.style.cursor = 'pointer';
+        uploadArea.style.userSelect = 'none';
+    }
+}, 2000);
+
+async function uploadFile(file) {
+    devLog('[UPLOAD] uploadFile called');
+    devLog('[UPLOAD] File:', file.name, 'Size:', file.size, 'Type:', file.type);
+    
+    // Check authentication first
+    const isAuthenticated = await requireAuthForUpload();
+    if (!isAuthenticated) {
+        devLog('[UPLOAD] User not authenticated - showing login modal');
+        // Store file for upload after login
+        pendingFile = file;
+        showLoginModal();
+        return;
+    }
+    
+    const uploadArea = document.getElementById('uploadArea');
+    const uploadIcon = document.getElementById('uploadIcon');
+    const uploadText = document.getElementById('uploadText');
+    const uploadHint = document.getElementById('uploadHint');
+    const uploadProgress = document.getElementById('uploadProgress');
+    const progressFill = document.getElementById('progressFill');
+    const progressText = document.getElementById('progressText');
+    
+    // Validate file type
+    const fileName = file.name.toLowerCase();
+    devLog('[UPLOAD] Validating file type:', fileName);
+    if (!fileName.endsWith('.zip') && !fileName.endsWith('.json')) {
+        devLog('[UPLOAD] Invalid file type');
+        showUploadError('Please upload a ZIP file or conversations.json');
+        return;
+    }
+    devLog('[UPLOAD] File type valid');
+    
+    // Helper to truncate filename from middle if > 40 chars
+    function truncateFilename(name, maxLength = 40) {
+        if (name.length <= maxLength) return name;
+        const ext = name.lastIndexOf('.') > -1 ? name.slice(name.lastIndexOf('.')) : '';
+        const nameWithoutExt = name.slice(0, name.length - ext.length);
+        const charsToShow = maxLength - ext.length - 3; // 3 for '...'
+        const frontChars = Math.ceil(charsToShow / 2);
+        const backChars = Math.floor(charsToShow / 2);
+        return nameWithoutExt.slice(0, frontChars) + '...' + nameWithoutExt.slice(-backChars) + ext;
+    }
+    
+    // Show upload state
+    uploadArea.classList.add('uploading');
+    uploadArea.classList.remove('error', 'success');
+    uploadIcon.textContent = '⏳';
+    uploadText.textContent = 'Uploading ' + truncateFilename(file.name);
+    uploadHint.textContent = 'Please wait...';
+    uploadProgress.classList.remove('hidden');
+    progressFill.style.width = '0%';
+    progressText.textContent = 'Preparing upload...';
+    
+    // Use background job processing for all files
+    const fileSize = file.size;
+    devLog('[UPLOAD] File size: ' + (fileSize / 1024 / 1024).toFixed(2) + 'MB - using background processing');
+    uploadFileWithBackgroundProcessing(file);
+}
+
+// Chunked upload for large files
+async function uploadFileChunked(file, chunkSize) {
+    const fileId = Date.now() + '_' + Math.random().toString(36).substr(2, 9);
+    const totalChunks = Math.ceil(file.size / chunkSize);
+    const progressFill = document.getElementById('progressFill');
+    const progressText = document.getElementById('progressText');
+    
+    devLog('[UPLOAD] Starting chunked upload: ' + totalChunks + ' chunks');
+    
+    try {
+        for (let chunkIndex = 0; chunkIndex < totalChunks; chunkIndex++) {
+            const start = chunkIndex * chunkSize;
+            const end = Math.min(start + chunkSize, file.size);
+            const chunk = file.slice(start, end);
+            
+            const formData = new FormData();
+            formData.append('chunk', chunk);
+            formData.append('chunkIndex', chunkIndex);
+            formData.append('totalChunks', totalChunks);
+            formData.append('fileId', fileId);
+            formData.append('filename', file.name);
+            
+            // Update progress (upload is 0-50%, processing will be 50-100%)
+            const chunkProgress = Math.round(((chunkIndex + 1) / totalChunks) * 50);
+            progressFill.style.width = chunkProgress + '%';
+            progressText.textContent = `Uploading chunk ${chunkIndex + 1}/${totalChunks}...`;
+            
+            // Upload chunk
+            const response = await fetch('/upload-chunk', {
+                method: 'POST',
+                body: formData,
+                credentials: 'include' // Send cookies
+            });
+            
+            if (!response.ok) {
+                if (response.status === 401 || response.status === 403) {
+                    pendingFile = file;
+                    showLoginModal();
+                    return;
+                }
+                const error = await response.json().catch(() => ({error: 'Upload failed'}));
+                throw new Error(error.error || 'Chunk upload failed');
+            }
+            
+            const result = await response.json();
+            devLog('[UPLOAD] Chunk response:', result);
+            
+            // The last chunk starts a background job; poll it like a regular upload
+            if (result.success && result.job_id) {
+                devLog('[UPLOAD] All chunks uploaded, job ID: ' + result.job_id);
+                progressText.textContent = 'Processing file...';
+                pollJobStatus(result.job_id);
+                return;
+            }
+        }
+    } catch (error) {
+        devError('[UPLOAD] Chunked upload error:', error);
+        showUploadError('Upload failed: ' + error.message);
+    }
+}
+
+// Background job processing - upload file, then poll for status
+function uploadFileWithBackgroundProcessing(file) {
+    const formData = new FormData();
+    formData.append('file', file);
+    
+    const fileToUpload = file;
+    const xhr = new XMLHttpRequest();
+    const progressFill = document.getElementById('progressFill');
+    const progressText = document.getElementById('progressText');
+    
+    // CRITICAL: Set withCredentials to send cookies/session with request
+    xhr.withCredentials = true;
+    
+    // Track upload progress (0-50%, processing will be 50-100%)
+    xhr.upload.addEventListener('progress', function(e) {
+        if (e.lengthComputable) {
+            const uploadPercent = Math.round((e.loaded / e.total) * 50);
+            progressFill.style.width = uploadPercent + '%';
+            progressText.textContent = Math.round((e.loaded / e.total) * 100) + '% uploaded';
+        }
+    });
+    
+    xhr.addEventListener('load', function() {
+        if (xhr.status === 200) {
+            try {
+                const response = JSON.parse(xhr.responseText);
+                if (response.success && response.job_id) {
+                    devLog('[UPLOAD] File uploaded, job ID: ' + response.job_id);
+                    progressText.textContent = 'Processing file...';
+                    // Start polling for job status
+                    pollJobStatus(response.job_id);
+                } else {
+                    showUploadError(response.error || 'Upload failed');
+                }
+            } catch (e) {
+                devError('[UPLOAD] Failed to parse response:', e);
+                showUploadError('Invalid response from server: ' + e.message);
+            }
+        } else if (xhr.status === 401 || xhr.status === 403) {
+            devLog('[UPLOAD] Authentication required (status: ' + xhr.status + ')');
+            document.getElementById('uploadArea').classList.remove('uploading');
+            pendingFile = fileToUpload;
+            showLoginModal();
+        } else {
+            try {
+                const response = JSON.parse(xhr.responseText);
+                showUploadError(response.error || 'Upload failed (status: ' + xhr.status + ')');
+            } catch (e) {
+                showUploadError('Upload failed: ' + xhr.statusText + ' (status: ' + xhr.status + ')');
+            }
+        }
+    });
+    
+    xhr.addEventListener('error', function() {
+        devError('[UPLOAD] Network error during upload');
+        showUploadError('Network error. Please check your connection and try again.');
+    });
+    
+    xhr.open('POST', '/upload');
+    progressText.textContent = 'Uploading file...';
+    xhr.send(formData);
+}
+
+// Poll job status
+async function pollJobStatus(jobId) {
+    const progressFill = document.getElementById('progressFill');
+    const progressText = document.getElementById('progressText');
+    const uploadArea = document.getElementById('uploadArea');
+    // Poll quickly at first (small exports finish in well under a second), then
+    // back off exponentially up to a 2s cap; give up after 5 minutes
+    const deadline = Date.now() + 5 * 60 * 1000;
+    let delay = 250;
+    const scheduleNextPoll = () => {
+        setTimeout(poll, delay);
+        delay = Math.min(delay * 2, 2000);
+    };
+    
+    const poll = async () => {
+        try {
+            const response = await fetch(`/upload-status/${jobId}`, {
+                credentials: 'include'
+            });
+            
+            if (!response.ok) {
+                if (response.status === 401 || response.status === 403) {
+                    showLoginModal();
+                    return;
+                }
+                throw new Error('Status check failed: ' + response.status);
+            }
+            
+            const status = await response.json();
+            devLog('[UPLOAD] Job status:', status);
+            
+            // Update progress
+            const progress = status.progress || 0;
+            // Upload was 0-50%, so processing is 50-100%
+            const totalProgress = 50 + (progress / 2);
+            progressFill.style.width = totalProgress + '%';
+            progressText.textContent = status.message || `Processing... ${progress}%`;
+            
+            if (status.status === 'completed') {
+                // Success!
+                uploadArea.classList.remove('uploading', 'error');
+                uploadArea.classList.add('success');
+                document.getElementById('uploadIcon').textContent = '✓';
+                document.getElementById('uploadText').textContent = 'Upload Successful!';
+                document.getElementById('uploadHint').textContent = status.message || 'Processing your conversations...';
+                progressText.textContent = 'Loading your conversations...';
+                progressFill.style.width = '100%';
+                
+                setTimeout(() => {
+                    window.location.reload();
+                }, 1500);
+                return;
+            } else if (status.status === 'error') {
+                showUploadError(status.error || 'Processing failed');
+                return;
+            } else if (status.status === 'processing' || status.status === 'queued') {
+                // Continue polling
+                if (Date.now() >= deadline) {
+                    showUploadError('Processing is taking too long. Please try again or contact support.');
+                    return;
+                }
+                scheduleNextPoll();
+            }
+        } catch (error) {
+            devError('[UPLOAD] Error polling job status:', error);
+            // Continue polling on error (might be temporary)
+            if (Date.now() < deadline) {
+                scheduleNextPoll();
+            } else {
+                showUploadError('Failed to check processing status. Please refresh the page.');
+            }
+        }
+    };
+    
+    // Start polling
+    poll();
+}
+
+function showUploadError(message) {
+    console.error('[UPLOAD] showUploadError:', message);
+    const uploadArea = document.getElementById('uploadArea');
+    const uploadIcon = document.getElementById('uploadIcon');
+    const uploadText = document.getElementById('uploadText');
+    const uploadHint = document.getElementById('uploadHint');
+    const uploadProgress = document.getElementById('uploadProgress');
+    
+    uploadArea.classList.remove('uploading');
+    uploadArea.classList.add('error');
+    uploadIcon.textContent = '⚠️';
+    uploadText.textContent = 'Upload failed';
+    uploadHint.innerHTML = message + '<br><br>Click to try again';
+    uploadProgress.classList.add('hidden');
+    
+    // Reset after 5 seconds
+    setTimeout(() => {
+        devLog('[UPLOAD] Resetting upload area after error');
+        uploadArea.classList.remove('error');
+        uploadIcon.textContent = '📦';
+        uploadText.textContent = 'Drop your ChatGPT export ZIP file here';
+        uploadHint.textContent = 'Or click to browse • Accepts .zip or conversations.json';
+    }, 5000);
+}
+
+function clearData() {
+    devLog('[DATA] clearData called');
+    if (confirm('Clear current data and upload a different file?')) {
+        devLog('[DATA] User confirmed, clearing data...');
+        fetch('/clear', { method: 'POST' })
+            .then(r => {
+                devLog('[DATA] /clear response status:', r.status);
+                if (!r.ok) {
+                    throw new Error('Server returned ' + r.status);
+                }
+                return r.json();
+            })
+            .then(data => {
+                devLog('[DATA] /clear response:', data);
+                if (data.success) {
+                    devLog('[DATA] Data cleared, reloading...');
+                    window.location.reload();
+                } else {
+                    alert('Failed to clear data: ' + (data.error || 'Unknown error'));
+                }
+            })
+            .catch(err => {
+                console.error('[DATA] Error clearing data:', err);
+                alert('Error clearing data: ' + err.message);
+            });
+    }
+}
+
+// Tab switching
+function switchTab(tabName) {
+    devLog('[UI] switchTab:', tabName);
+    // Update tab buttons
+    document.querySelectorAll('.tab-btn').forEach(btn => {
+        btn.classList.toggle('active', btn.dataset.tab === tabName);
+    });
+    
+    // Update tab content
+    document.querySelectorAll('.tab-content').forEach(content => {
+        content.classList.remove('active');
+    });
+    document.getElementById(tabName + 'Tab').classList.add('active');
+    
+    // The virtual list could not measure its rows while hidden
+    if (tabName === 'conversations' && virtualList && !virtualList.rowHeight) {
+        renderVirtualWindow(true);
+    }
+}
+
+// View a specific project
+function viewProject(projectId, projectName) {
+    devLog('[UI] viewProject:', projectId, projectName);
+    // Switch to conversations tab
+    switchTab('conversations');
+    
+    // Filter to this project
+    setActiveProjectItem(projectItems.find(item => item.dataset.filter === projectId) || null);
+    
+    DOM.conversationsTitle.textContent = projectName;
+    filterConversations(projectId);
+}
+
+// Project filter
+let projectItems = [];
+let activeProjectItem = null;
+
+function setActiveProjectItem(item) {
+    if (activeProjectItem) activeProjectItem.classList.remove('active');
+    if (item) item.classList.add('active');
+    activeProjectItem = item;
+}
+
+function initProjectFilter() {
+    projectItems = [...document.querySelectorAll('.project-item')];
+    activeProjectItem = projectItems.find(item => item.classList.contains('active')) || null;
+    
+    // One delegated listener on the sidebar list instead of one per item
+    const list = document.querySelector('.project-list');
+    if (!list) return;
+    list.addEventListener('click', function(e) {
+        const item = e.target.closest('.project-item');
+        if (!item) return;
+        setActiveProjectItem(item);
+        
+        const filter = item.dataset.filter;
+        const title = item.querySelector('.project-name').textContent.trim();
+        DOM.conversationsTitle.textContent = title.replace(/^[📚📁📄] /, '');
+        
+        filterConversations(filter);
+    });
+}
+
+// Indices into allConversations currently shown in the list (null = all).
+// Filtering, search and smart groups all go through applyVisibleConversations.
+let visibleConversations = null;
+
+// Above this many conversations the list is windowed: only the rows in view
+// (plus some overscan) are attached, between two spacers sized to the rest.
+const VIRTUAL_LIST_THRESHOLD = 500;
+const VIRTUAL_LIST_OVERSCAN = 10;
+let virtualList = null;
+
+function applyVisibleConversations(indices) {
+    visibleConversations = indices;
+    
+    if (virtualList) {
+        virtualList.list.scrollTop = 0;
+        renderVirtualWindow(true);
+        return;
+    }
+    
+    // Only touch rows whose visibility actually changes
+    const show = new Uint8Array(allConversations.length);
+    if (indices === null) {
+        show.fill(1);
+    } else {
+        for (const i of indices) show[i] = 1;
+    }
+    for (let i = 0; i < allConversations.length; i++) {
+        const conv = allConversations[i];
+        const hidden = !show[i];
+        if (conv.hidden !== hidden) {
+            conv.hidden = hidden;
+            conv.el.style.display = hidden ? 'none' : '';
+        }
+    }
+}
+
+function initVirtualList() {
+    const list = document.getElementById('conversationList');
+    if (!list || allConversations.length <= VIRTUAL_LIST_THRESHOLD) return;
+    
+    const topSpacer = document.createElement('div');
+    const bottomSpacer = document.createElement('div');
+    list.classList.add('virtualized');
+    list.replaceChildren(topSpacer, bottomSpacer);
+    virtualList = { list, topSpacer, bottomSpacer, rowHeight: 0, start: -1, end: -1 };
+    
+    let scheduled = false;
+    list.addEventListener('scroll', function() {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => {
+            scheduled = false;
+            renderVirtualWindow(false);
+        });
+    }, { passive: true });
+    window.addEventListener('resize', function() {
+        virtualList.rowHeight = 0;
+        renderVirtualWindow(true);
+    });
+    
+    renderVirtualWindow(true);
+    devLog('[UI] Virtualized conversation list,', allConversations.length, 'rows');
+}
+
+function renderVirtualWindow(force) {
+    const v = virtualList;
+    const total = visibleConversations === null ? allConversations.length : visibleConversations.length;
+    const indexAt = k => visibleConversations === null ? k : visibleConversations[k];
+    
+    // Rows are fixed height in virtualized mode; measure one once it is attached.
+    // A hidden tab measures 0, so keep the estimate unsaved until the list is shown.
+    if (!v.rowHeight && total > 0) {
+        const probe = allConversations[indexAt(0)].el;
+        v.list.insertBefore(probe, v.bottomSpacer);
+        v.rowHeight = probe.offsetHeight;
+    }
+    const rowHeight = v.rowHeight || 88;
+    
+    const scrollTop = v.list.scrollTop;
+    const viewport = v.list.clientHeight || window.innerHeight;
+    const start = Math.max(0, Math.floor(scrollTop / rowHeight) - VIRTUAL_LIST_OVERSCAN);
+    const end = Math.min(total, Math.ceil((scrollTop + viewport) / rowHeight) + VIRTUAL_LIST_OVERSCAN);
+    if (!force && start === v.start && end === v.end) return;
+    v.start = start;
+    v.end = end;
+    
+    const frag = document.createDocumentFragment();
+    for (let k = start; k < end; k++) {
+        frag.appendChild(allConversations[indexAt(k)].el);
+    }
+    v.topSpacer.style.height = (start * rowHeight) + 'px';
+    v.bottomSpacer.style.height = ((total - end) * rowHeight) + 'px';
+    v.list.replaceChildren(v.topSpacer, frag, v.bottomSpacer);
+}
+
+// The project filter or smart group currently shown, restored when a search is cleared
+let currentFilter = 'all';
+let currentSmartGroup = null;
+
+function filterConversations(filter) {
+    devLog('[UI] filterConversations:', filter);
+    currentFilter = filter;
+    currentSmartGroup = null;
+    resetSearchState();
+    if (filter === 'all') {
+        applyVisibleConversations(null);
+        devLog('[UI] Filter result:', allConversations.length, 'visible conversations');
+        return;
+    }
+    const indices = [];
+    for (let i = 0; i < allConversations.length; i++) {
+        if (allConversations[i].project === filter) indices.push(i);
+    }
+    applyVisibleConversations(indices);
+    devLog('[UI] Filter result:', indices.length, 'visible conversations');
+}
+
+// Last search and the indices (into allConversations) it left visible.
+// Reset whenever something else changes which conversations are shown.
+let lastSearchQuery = '';
+let lastSearchMatches = null;
+
+function resetSearchState() {
+    lastSearchQuery = '';
+    lastSearchMatches = null;
+}
+
+function searchConversations() {
+    const query = DOM.searchInput.value.toLowerCase();
+    devLog('[SEARCH] searchConversations:', query);
+
+    // One character doesn't narrow anything useful: put back whatever view was
+    // active before the search, once, and skip the scan until the query grows
+    if (query.trim().length < 2) {
+        if (lastSearchMatches === null) return;
+        if (currentSmartGroup) {
+            viewSmartGroup(currentSmartGroup);
+        } else {
+            filterConversations(currentFilter);
+        }
+        return;
+    }
+
+    // Typing more characters can only narrow the results, so re-test just the
+    // previous matches; everything else is already hidden
+    const narrowing = lastSearchMatches !== null && query.startsWith(lastSearchQuery);
+    const candidates = narrowing ? lastSearchMatches : allConversations.keys();
+    const matches = [];
+
+    for (const i of candidates) {
+        const conv = allConversations[i];
+        if (conv.titleLower.indexOf(query) !== -1 || conv.previewLower.indexOf(query) !== -1) {
+            matches.push(i);
+        }
+    }
+
+    applyVisibleConversations(matches);
+    lastSearchQuery = query;
+    lastSearchMatches = matches;
+    devLog('[SEARCH] Found', matches.length, 'matches');
+}
+
+function initSearch() {
+    const searchInput = DOM.searchInput;
+    if (!searchInput) return;
+    
+    let searchTimeout;
+    searchInput.addEventListener('input', function() {
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(searchConversations, 120);
+    });
+    searchInput.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            clearTimeout(searchTimeout);
+            searchConversations();
+        }
+    });
+}
+
+function showConversation(id) {
+    devLog('[CONV] showConversation:', id);
+    fetch(`/conversation/${id}`)
+        .then(r => {
+            devLog('[CONV] Response status:', r.status);
+            return r.json();
+        })
+        .then(data => {
+            devLog('[CONV] Loaded conversation:', data.title);
+            devLog('[CONV] Messages count:', data.messages ? data.messages.length : 0);
+            currentConversation = data;
+            currentMarkdown = data.markdown;
+            
+            DOM.modalTitle.textContent = data.title;
+            
+            let subtitle = [];
+            if (data.project_name) subtitle.push(`Project: ${data.project_name}`);
+            if (data.create_time) subtitle.push(`Created: ${data.create_time}`);
+            if (data.model) subtitle.push(`Model: ${data.model}`);
+            DOM.modalSubtitle.textContent = subtitle.join(' • ');
+            
+            // Build nodes directly; textContent needs no escaping and skips the HTML parser
+            const frag = document.createDocumentFragment();
+            data.messages.forEach(msg => {
+                const isUser = msg.role === 'user';
+                const div = document.createElement('div');
+                div.className = 'message ' + (isUser ? 'user' : 'assistant');
+
+                const header = document.createElement('div');
+                header.className = 'message-header';
+                header.textContent = (isUser ? '👤 ' : '🤖 ') + msg.role.charAt(0).toUpperCase() + msg.role.slice(1);
+
+                const content = document.createElement('div');
+                content.className = 'message-content';
+                content.textContent = msg.content;
+
+                div.append(header, content);
+                frag.append(div);
+            });
+
+            DOM.modalBody.replaceChildren(frag);
+            DOM.modalOverlay.classList.add('active');
+        })
+        .catch(err => {
+            console.error('[CONV] Error loading conversation:', err);
+            showToast('Failed to load conversation');
+        });
+}
+
+function closeModal(event) {
+    devLog('[UI] closeModal called');
+    if (!event || event.target === DOM.modalOverlay) {
+        DOM.modalOverlay.classList.remove('active');
+    }
+}
+
+function copyToClipboard() {
+    devLog('[UI] copyToClipboard, markdown length:', currentMarkdown ? currentMarkdown.length : 0);
+    navigator.clipboard.writeText(currentMarkdown).then(() => {
+        devLog('[UI] Copied to clipboard successfully');
+        showToast('Copied to clipboard!');
+    }).catch(err => {
+        console.error('[UI] Copy to clipboard failed:', err);
+        showToast('Failed to copy');
+    });
+}
+
+function showToast(message) {
+    devLog('[UI] showToast:', message);
+    const toast = DOM.toast;
+    toast.textContent = message;
+    toast.classList.add('show');
+    setTimeout(() => toast.classList.remove('show'), 2500);
+}
+
+const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
+// String-only escaping for the few places that still build markup
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, c => HTML_ESCAPES[c]);
+}
+
+function exportAll() {
+    devLog('[EXPORT] exportAll called');
+    window.location.href = '/export-all';
+}
+
+// Keyboard shortcuts
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') closeModal();
+});
+
+// Smart Groups functionality
+// Parsed from localStorage at DOMContentLoaded rather than during script load
+let smartGroups = [];
+let allConversations = [];
+
+function loadSmartGroups() {
+    try {
+        smartGroups = JSON.parse(localStorage.getItem('otc_smart_groups') || '[]');
+    } catch (e) {
+        smartGroups = [];
+    }
+    devLog('[SMART] Loaded', smartGroups.length, 'smart groups from localStorage');
+}
+
+// Writes are coalesced and done when the browser is idle; a pending write is
+// flushed synchronously if the page is hidden or unloaded first
+let smartGroupsSaveScheduled = false;
+const scheduleIdle = window.requestIdleCallback
+    ? cb => window.requestIdleCallback(cb, { timeout: 1000 })
+    : cb => setTimeout(cb, 200);
+
+function flushSmartGroups() {
+    if (!smartGroupsSaveScheduled) return;
+    smartGroupsSaveScheduled = false;
+    localStorage.setItem('otc_smart_groups', JSON.stringify(smartGroups));
+}
+
+function saveSmartGroups() {
+    if (smartGroupsSaveScheduled) return;
+    smartGroupsSaveScheduled = true;
+    scheduleIdle(flushSmartGroups);
+}
+
+window.addEventListener('pagehide', flushSmartGroups);
+document.addEventListener('visibilitychange', function() {
+    if (document.visibilityState === 'hidden') flushSmartGroups();
+});
+
+// Load conversation data
+document.addEventListener('DOMContentLoaded', function() {
+    devLog('[INIT] DOMContentLoaded - loading conversation data');
+    cacheDomHandles();
+    loadSmartGroups();
+    initSearch();
+    initProjectFilter();
+    initSmartGroupsList();
+    initConversationList();
+    
+    // Get all conversation items
+    document.querySelectorAll('.conversation-item').forEach(item => {
+        const title = item.querySelector('.conv-title').textContent;
+        allConversations.push({
+            id: item.dataset.id,
+            title: title,
+            titleLower: title.toLowerCase(),
+            previewLower: item.querySelector('.conv-preview').textContent.toLowerCase(),
+            project: item.dataset.project,
+            el: item,
+            hidden: false
+        });
+    });
+    devLog('[INIT] Loaded', allConversations.length, 'conversations');
+    matchCountCache.clear();
+    buildKeywordVocabulary();
+    initVirtualList();
+    
+    renderSmartGroups();
+    generateSuggestedGroups();
+    initKeywordAutocomplete();
+});
+
+// Keyword autocomplete for Smart Groups
+function initKeywordAutocomplete() {
+    const keywordInput = DOM.groupKeywords;
+    const dropdown = DOM.keywordDropdown;
+    if (!keywordInput || !dropdown) return;
+    
+    let timeout;
+    
+    keywordInput.addEventListener('input', function() {
+        clearTimeout(timeout);
+        const value = this.value;
+        const lastKeyword = value.split(',').pop().trim().toLowerCase();
+        
+        if (lastKeyword.length < 2) {
+            dropdown.classList.remove('active');
+            return;
+        }
+        
+        timeout = setTimeout(() => {
+            showKeywordSuggestions(lastKeyword, dropdown);
+        }, 100);
+    });
+    
+    keywordInput.addEventListener('focus', function() {
+        const value = this.value;
+        const lastKeyword = value.split(',').pop().trim().toLowerCase();
+        if (lastKeyword.length >= 2) {
+            showKeywordSuggestions(lastKeyword, dropdown);
+        }
+    });
+    
+    document.addEventListener('click', function(e) {
+        if (!e.target.closest('.autocomplete-wrapper')) {
+            dropdown.classList.remove('active');
+        }
+    });
+    
+    keywordInput.addEventListener('keydown', function(e) {
+        if (e.key === 'Escape') {
+            dropdown.classList.remove('active');
+        }
+    });
+}
+
+// Unique title words (3+ chars) mapped to the first title they appear in.
+// Built once after conversations load so keystrokes only scan the vocabulary.
+const keywordVocabulary = new Map();
+
+function buildKeywordVocabulary() {
+    keywordVocabulary.clear();
+    for (const conv of allConversations) {
+        for (const token of conv.titleLower.split(/\s+/)) {
+            const word = token.replace(/[^a-z0-9]/g, '');
+            if (word.length > 2 && !keywordVocabulary.has(word)) {
+                keywordVocabulary.set(word, conv.title);
+            }
+        }
+    }
+}
+
+function showKeywordSuggestions(query, dropdown) {
+    const wordMatches = new Map();
+    for (const [word, title] of keywordVocabulary) {
+        if (word.includes(query)) {
+            wordMatches.set(word, title);
+            if (wordMatches.size === 8) break;
+        }
+    }
+    
+    if (wordMatches.size === 0) {
+        dropdown.innerHTML = '<div style="padding: 0.75rem; color: var(--text-muted); font-size: 0.8125rem;">No matches found</div>';
+    } else {
+        let html = '';
+        
+        // Show word matches first
+        for (const [word, title] of wordMatches) {
+            html += `
+                <div class="autocomplete-item" onclick="addKeyword('${word}')">
+                    <div class="autocomplete-match">${word}</div>
+                    <div class="autocomplete-title">from: ${escapeHtml(title)}</div>
+                </div>
+            `;
+        }
+        
+        dropdown.innerHTML = html;
+    }
+    
+    dropdown.classList.add('active');
+}
+
+function addKeyword(word) {
+    const input = DOM.groupKeywords;
+    const currentValue = input.value;
+    const parts = currentValue.split(',').map(p => p.trim()).filter(p => p);
+    
+    // Remove the partial keyword being typed
+    if (parts.length > 0) {
+        parts.pop();
+    }
+    parts.push(word);
+    
+    input.value = parts.join(', ') + ', ';
+    input.focus();
+    DOM.keywordDropdown.classList.remove('active');
+}
+
+function createSmartGroup() {
+    devLog('[SMART] createSmartGroup called');
+    const name = DOM.groupName.value.trim();
+    const keywords = DOM.groupKeywords.value.trim();
+    devLog('[SMART] Name:', name, 'Keywords:', keywords);
+    
+    if (!name || !keywords) {
+        devLog('[SMART] Missing name or keywords');
+        showToast('Please enter both name and keywords');
+        return;
+    }
+    
+    const keywordList = keywords.split(',').map(k => k.trim().toLowerCase()).filter(k => k);
+    devLog('[SMART] Keyword list:', keywordList);
+    
+    const group = {
+        id: 'smart_' + Date.now(),
+        name: name,
+        keywords: keywordList,
+        icon: '📂'
+    };
+    
+    smartGroups.push(group);
+    saveSmartGroups();
+    devLog('[SMART] Group saved, total groups:', smartGroups.length);
+    
+    DOM.groupName.value = '';
+    DOM.groupKeywords.value = '';
+    
+    // Only the new card needs work; the first card replaces the empty state
+    const container = DOM.smartGroupsList;
+    if (smartGroups.length === 1) {
+        renderSmartGroups();
+    } else if (container) {
+        container.appendChild(buildSmartGroupCard(group));
+    }
+    showToast(`Created group "${name}"`);
+}
+
+// One alternation per group so a title is tested in a single regex pass
+// instead of one includes() per keyword. Kept in a WeakMap so the compiled
+// pattern never ends up in localStorage. Keywords are already lowercase.
+const smartGroupRegexes = new WeakMap();
+
+function smartGroupRegex(group) {
+    let regex = smartGroupRegexes.get(group);
+    if (!regex) {
+        const pattern = group.keywords.map(k => k.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')).join('|');
+        regex = pattern ? new RegExp(pattern) : /(?!)/;
+        smartGroupRegexes.set(group, regex);
+    }
+    return regex;
+}
+
+// Match counts keyed by the group's keyword list. Conversations only load
+// once, so entries stay valid until allConversations changes.
+const matchCountCache = new Map();
+
+function smartGroupMatchCount(group) {
+    const key = JSON.stringify(group.keywords);
+    let count = matchCountCache.get(key);
+    if (count === undefined) {
+        const regex = smartGroupRegex(group);
+        count = allConversations.filter(conv => regex.test(conv.titleLower)).length;
+        matchCountCache.set(key, count);
+    }
+    return count;
+}
+
+function buildSmartGroupCard(group) {
+    const template = document.getElementById('smartGroupCardTemplate').content.firstElementChild;
+    const card = template.cloneNode(true);
+    card.dataset.groupId = group.id;
+    card.querySelector('.project-card-icon').textContent = group.icon;
+    card.querySelector('.project-card-title').textContent = group.name;
+    card.querySelector('.project-card-stat-value').textContent = smartGroupMatchCount(group);
+    card.querySelector('.project-card-recent').textContent = 'Keywords: ' + group.keywords.join(', ');
+    return card;
+}
+
+function renderSmartGroups() {
+    devLog('[SMART] renderSmartGroups, groups count:', smartGroups.length);
+    const container = DOM.smartGroupsList;
+    if (!container) {
+        devLog('[SMART] Smart groups container not found (might be on landing page)');
+        return;
+    }
+    const frag = document.createDocumentFragment();
+    smartGroups.forEach(group => frag.appendChild(buildSmartGroupCard(group)));
+    container.replaceChildren(frag);
+    
+    if (smartGroups.length === 0) {
+        container.innerHTML = `
+            <div style="grid-column: 1 / -1; text-align: center; padding: 2rem; color: var(--text-muted);">
+                <p>No smart groups yet. Create one above!</p>
+                <p style="margin-top: 0.5rem; font-size: 0.9rem;">
+                    Try creating groups like "Emails" with keywords "[company name], [project name], [client name], etc"
+                </p>
+            </div>
+        `;
+    }
+}
+
+// One listener for every row; items only carry data-id
+function initConversationList() {
+    const list = document.getElementById('conversationList');
+    if (!list) return;
+    list.addEventListener('click', function(e) {
+        const item = e.target.closest('.conversation-item');
+        if (item) showConversation(item.dataset.id);
+    });
+}
+
+// Card clicks are handled once on the container; cards only carry data-group-id
+function initSmartGroupsList() {
+    const container = DOM.smartGroupsList;
+    if (!container) return;
+    container.addEventListener('click', function(e) {
+        const card = e.target.closest('[data-group-id]');
+        if (!card) return;
+        const groupId = card.dataset.groupId;
+        if (e.target.closest('.smart-group-delete')) {
+            deleteSmartGroup(groupId);
+            return;
+        }
+        const group = smartGroups.find(g => g.id === groupId);
+        if (group) viewSmartGroup(group);
+    });
+}
+
+function deleteSmartGroup(groupId) {
+    devLog('[SMART] deleteSmartGroup:', groupId);
+    const removed = smartGroups.find(g => g.id === groupId);
+    smartGroups = smartGroups.filter(g => g.id !== groupId);
+    saveSmartGroups();
+    
+    if (removed) {
+        const key = JSON.stringify(removed.keywords);
+        if (!smartGroups.some(g => JSON.stringify(g.keywords) === key)) {
+            matchCountCache.delete(key);
+        }
+    }
+    
+    const card = DOM.smartGroupsList && DOM.smartGroupsList.querySelector(`[data-group-id="${CSS.escape(groupId)}"]`);
+    if (smartGroups.length === 0 || !card) {
+        renderSmartGroups();
+    } else {
+        card.remove();
+    }
+    showToast('Group deleted');
+}
+
+function viewSmartGroup(group) {
+    devLog('[SMART] viewSmartGroup:', group.name);
+    switchTab('conversations');
+    
+    setActiveProjectItem(null);
+    DOM.conversationsTitle.textContent = group.name;
+    
+    // Filter conversations by keywords
+    currentSmartGroup = group;
+    resetSearchState();
+    const regex = smartGroupRegex(group);
+    const indices = [];
+    for (let i = 0; i < allConversations.length; i++) {
+        if (regex.test(allConversations[i].titleLower)) indices.push(i);
+    }
+    applyVisibleConversations(indices);
+    devLog('[SMART] Showing', indices.length, 'conversations for group', group.name);
+}
+
+function generateSuggestedGroups() {
+    const container = DOM.suggestedGroups;
+    if (!container) return;
+    
+    // Analyze conversation titles to find common words
+    const wordCounts = new Map();
+    const stopWords = new Set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'new', 'chat', 'help', 'how', 'what', 'why', 'when', 'where', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'shall', 'can', 'need', 'make', 'made', 'get', 'got', 'this', 'that', 'these', 'those', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'us', 'them', 'using', 'code', 'app']);
+    
+    for (const conv of allConversations) {
+        for (const token of conv.titleLower.split(/\s+/)) {
+            const word = token.replace(/[^a-z0-9]/g, '');
+            if (word.length > 3 && !stopWords.has(word)) {
+                wordCounts.set(word, (wordCounts.get(word) || 0) + 1);
+            }
+        }
+    }
+    
+    // Get top keywords that appear in multiple conversations
+    const suggestions = [...wordCounts]
+        .filter(([word, count]) => count >= 3)
+        .sort((a, b) => b[1] - a[1])
+        .slice(0, 8);
+    
+    if (suggestions.length === 0) {
+        container.innerHTML = '<p style="color: var(--text-muted); grid-column: 1 / -1;">No suggestions available yet.</p>';
+        return;
+    }
+    
+    container.innerHTML = suggestions.map(([word, count]) => `
+        <div class="project-card" onclick="suggestGroup('${word}')" style="cursor: pointer;">
+            <div class="project-card-icon">💡</div>
+            <h3 class="project-card-title" style="text-transform: capitalize;">${word}</h3>
+            <div class="project-card-stats">
+                <div class="project-card-stat">
+                    <div class="project-card-stat-value">${count}</div>
+                    <div class="project-card-stat-label">Matches</div>
+                </div>
+            </div>
+            <div class="project-card-recent">Click to create group</div>
+        </div>
+    `).join('');
+}
+
+function suggestGroup(keyword) {
+    DOM.groupName.value = keyword.charAt(0).toUpperCase() + keyword.slice(1);
+    DOM.groupKeywords.value = keyword;
+    DOM.groupName.focus();
+    showToast('Edit the group name and keywords, then click Create');
+}
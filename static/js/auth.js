@@ -0,0 +1,195 @@
+// Local-only mode: authentication disabled, everything runs offline
+let firebaseApp = null;
+let currentUser = null;
+let pendingFile = null;
+
+async function initFirebase() {
+    devLog('[AUTH] Firebase disabled (local-only mode)');
+    return;
+}
+
+async function checkAuthStatus() {
+    // Always allow in local-only mode
+    return { authenticated: true };
+}
+
+async function requireAuthForUpload() {
+    return true;
+}
+
+// Login overlay element, looked up on first use
+let _loginOverlayEl = null;
+
+function loginOverlay() {
+    return _loginOverlayEl || (_loginOverlayEl = document.getElementById('loginModalOverlay'));
+}
+
+// Show login modal
+function showLoginModal() {
+    devLog('[AUTH] showLoginModal called');
+    const modal = loginOverlay();
+    devLog('[AUTH] Modal element:', modal);
+    if (modal) {
+        modal.classList.add('active');
+        devLog('[AUTH] Login modal shown');
+    } else {
+        devError('[AUTH] Login modal element not found!');
+    }
+}
+
+// Close login modal
+function closeLoginModal(event) {
+    devLog('[AUTH] closeLoginModal called');
+    const overlay = loginOverlay();
+    if (overlay && (!event || event.target === overlay)) {
+        overlay.classList.remove('active');
+    }
+}
+
+// Backdrop clicks close the modal; one listener bound once on the overlay itself.
+// This script is included after the modal markup, so the element already exists.
+(function initLoginModal() {
+    const overlay = loginOverlay();
+    if (!overlay) return;
+    overlay.addEventListener('click', function(e) {
+        if (e.target === overlay) overlay.classList.remove('active');
+    });
+})();
+
+// Firebase error codes mapped to friendly messages
+const ERROR_MAP = Object.freeze({
+    'auth/internal-error': 'There was a problem with the sign-in service. Please try again in a moment.',
+    'auth/network-request-failed': 'Network error. Please check your internet connection and try again.',
+    'auth/popup-closed-by-user': 'Sign-in was cancelled. Please try again if you want to continue.',
+    'auth/popup-blocked': 'The sign-in popup was blocked. Please allow popups for this site and try again.',
+    'auth/cancelled-popup-request': 'Another sign-in attempt is already in progress. Please wait.',
+    'auth/unauthorized-domain': 'This domain is not authorized. Please contact support.',
+    'auth/invalid-api-key': 'Configuration error. Please contact support.',
+    'auth/operation-not-allowed': 'Sign-in method is not enabled. Please contact support.',
+    'auth/too-many-requests': 'Too many sign-in attempts. Please wait a few minutes and try again.',
+    'auth/user-disabled': 'This account has been disabled. Please contact support.',
+    'auth/user-not-found': 'Account not found. Please try a different account.',
+    'auth/wrong-password': 'Incorrect password. Please try again.',
+    'auth/email-already-in-use': 'This email is already in use. Please try a different account.',
+    'auth/weak-password': 'Password is too weak. Please use a stronger password.',
+    'auth/invalid-email': 'Invalid email address. Please check and try again.',
+    'auth/account-exists-with-different-credential': 'An account with this email already exists. Please use a different sign-in method.'
+});
+
+// Convert technical Firebase errors to user-friendly messages
+function getUserFriendlyError(error) {
+    if (!error) return 'Something went wrong. Please try again.';
+    
+    const errorCode = error.code || '';
+    const errorMessage = error.message || String(error);
+    
+    // Check if we have a mapped message
+    if (errorCode && ERROR_MAP[errorCode]) {
+        return ERROR_MAP[errorCode];
+    }
+    
+    // For production, show generic message; for development, show actual error
+    if (IS_PRODUCTION) {
+        // In production, hide technical details
+        if (errorCode && errorCode.startsWith('auth/')) {
+            return 'Sign-in failed. Please try again or contact support if the problem persists.';
+        }
+        return 'Something went wrong. Please try again.';
+    } else {
+        // In development, show the actual error for debugging
+        return errorMessage;
+    }
+}
+
+// Local-only sign-in stub (no auth required)
+async function signInWithGoogle() {
+    devLog('[AUTH] Sign-in skipped (local-only mode)');
+    const overlay = loginOverlay();
+    if (overlay) requestAnimationFrame(() => overlay.classList.remove('active'));
+    return true;
+}
+
+// Update UI - NO Firebase dependency
+// Builds the header off-DOM and swaps it in within one animation frame
+function updateUserUI(user) {
+    const headerActions = document.getElementById('headerActions');
+    if (!headerActions || !user) return;
+    
+    const frag = document.createDocumentFragment();
+    const userInfo = document.createElement('div');
+    userInfo.className = 'user-info';
+    if (user.photoURL) {
+        const avatar = document.createElement('img');
+        avatar.src = user.photoURL;
+        avatar.alt = user.name || '';
+        avatar.className = 'user-avatar';
+        avatar.onerror = () => { avatar.style.display = 'none'; };
+        userInfo.appendChild(avatar);
+    }
+    const name = document.createElement('span');
+    name.textContent = user.name || user.email;
+    userInfo.appendChild(name);
+    const logoutBtn = document.createElement('button');
+    logoutBtn.className = 'logout-btn';
+    logoutBtn.textContent = 'Logout';
+    logoutBtn.addEventListener('click', signOut);
+    userInfo.appendChild(logoutBtn);
+    frag.appendChild(userInfo);
+    
+    const clearBtn = document.createElement('button');
+    clearBtn.className = 'header-action-btn';
+    clearBtn.textContent = '↻ Load Different Data';
+    clearBtn.addEventListener('click', clearData);
+    frag.appendChild(clearBtn);
+    
+    requestAnimationFrame(() => headerActions.replaceChildren(frag));
+}
+
+// Sign out - NO Firebase dependency after initial signout
+async function signOut() {
+    await fetch('/logout', { method: 'POST' }).catch(() => {});
+    currentUser = null;
+    
+    // The server cleared the whole session, loaded conversations included,
+    // so reload rather than leave them on screen
+    location.reload();
+}
+
+function waitForFirebase() {
+    document.body.style.display = 'block';
+}
+
+// Global error handler to prevent white screen
+window.addEventListener('error', function(e) {
+    console.error('[GLOBAL ERROR]', e.error, e.message, e.filename, e.lineno);
+    // Ensure page is visible even if there's an error
+    document.body.style.display = 'block';
+    document.body.style.visibility = 'visible';
+});
+
+// Initialize on page load with error handling
+try {
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', function() {
+            try {
+                waitForFirebase();
+            } catch (e) {
+                console.error('[INIT ERROR]', e);
+                // Show page even if initialization fails
+                document.body.style.display = 'block';
+            }
+        });
+    } else {
+        try {
+            waitForFirebase();
+        } catch (e) {
+            console.error('[INIT ERROR]', e);
+            document.body.style.display = 'block';
+        }
+    }
+} catch (e) {
+    console.error('[CRITICAL INIT ERROR]', e);
+    // Ensure page is visible
+    document.body.style.display = 'block';
+    document.body.style.visibility = 'visible';
+}
@@ -0,0 +1,58 @@
+"""Upload status polling for chunked uploads"""
+
+import io
+import os
+import sys
+import time
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as transfercc
+
+
+def _zip_bytes(files):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+class ChunkedUploadStatusTest(unittest.TestCase):
+    def setUp(self):
+        self.client = transfercc.app.test_client()
+
+    def _upload_chunked(self, data, filename, total_chunks=2):
+        size = len(data) // total_chunks + 1
+        file_id = f'test{time.time_ns()}'
+        for index in range(total_chunks):
+            response = self.client.post('/upload-chunk', data={
+                'chunk': (io.BytesIO(data[index * size:(index + 1) * size]), 'blob'),
+                'chunkIndex': str(index),
+                'totalChunks': str(total_chunks),
+                'fileId': file_id,
+                'filename': filename,
+            }, content_type='multipart/form-data')
+            self.assertEqual(response.status_code, 200)
+        return response.get_json()['job_id']
+
+    def _wait_for_job(self, job_id):
+        for _ in range(100):
+            response = self.client.get(f'/upload-status/{job_id}')
+            body = response.get_json()
+            if body.get('status') in ('completed', 'error'):
+                return response
+            time.sleep(0.05)
+        self.fail(f'job {job_id} did not finish')
+
+    def test_failed_chunked_job_reports_error(self):
+        job_id = self._upload_chunked(_zip_bytes({'notes.txt': 'no export here'}), 'export.zip')
+        response = self._wait_for_job(job_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['error'], 'No conversations.json found in ZIP file')
+
+
+if __name__ == '__main__':
+    unittest.main()